@@ -175,9 +175,9 @@ def upload_file():
 # get all cases API
 @app.route('/api/cases')
 def get_all_cases():
-    """Get all cases API"""
+    """Get all cases API (feeds the myCases.txt-style export in app.js)"""
     try:
-        cases = db.get_all_cases()
+        cases = db.get_all_cases_for_export()
         return jsonify(cases)
     except Exception as e:
         print(f"Get all cases error: {e}")
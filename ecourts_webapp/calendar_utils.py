@@ -1,36 +1,392 @@
 import datetime
+import functools
+import hashlib
+import json
+import logging
 import os
-import pickle
+import random
 import re
-from typing import Optional, List, Dict
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, List, Dict, Tuple
+import httplib2
+from google_auth_httplib2 import AuthorizedHttp
 from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
 from google_auth_oauthlib.flow import InstalledAppFlow
+from google.oauth2.credentials import Credentials
 from google.auth.transport.requests import Request
 
+# Per-event detail goes through this logger at DEBUG level so the hot loops
+# skip the formatting entirely unless it is switched on
+logger = logging.getLogger(__name__)
+
 SCOPES = [
     'https://www.googleapis.com/auth/calendar',  # Full calendar access
     'https://www.googleapis.com/auth/calendar.events'  # Events access
 ]
 
+# Largest page the Calendar API returns from events.list
+_MAX_PAGE_SIZE = 2500
+
+# Private extended property stamped on every event this app creates, so our
+# events can be found with a server-side filter instead of a full scan
+_EVENT_SOURCE = 'ecourts'
+
+# "CINO: ..." line written into event descriptions by older versions
+_CINO_RE = re.compile(r'cino:\s*(\S+)', re.IGNORECASE)
+
+# Markers of a court event, matched case-insensitively in one pass per field
+_COURT_SUMMARY_RE = re.compile(r' vs | v\.? ', re.IGNORECASE)
+_COURT_DESCRIPTION_RE = re.compile(
+    r'cino:|case no:|case_no:|state_name[: ]|establishment:|establishment_name:', re.IGNORECASE
+)
+
+# Event description layout; the "Case No:" line is what later syncs match on
+_DESCRIPTION_TEMPLATE = (
+    "Case No: {case_no}\n"
+    "Case Type: {case_type}\n"
+    "Court/Judge: {court}\n"
+    "Next Stage: {stage}"
+)
+
+# Hearing dates are stored as ISO YYYY-MM-DD; other layouts go through strptime
+_ISO_DATE_RE = re.compile(r'\d{4}-\d{2}-\d{2}')
+_DATE_FORMATS = ('%Y-%m-%d', '%d/%m/%Y', '%d-%m-%Y', '%Y/%m/%d')
+
+# date_next_list placeholders for cases without a scheduled hearing
+_NO_HEARING_DATES = frozenset(['Not set', '', None, 'Not scheduled'])
+
+# How far back the duplicate lookup looks when syncing cases
+_EXISTING_EVENTS_LOOKBACK_DAYS = 365
+
+# Incremental-sync state for the duplicate lookup: per account and calendar,
+# the last nextSyncToken plus the CINO and start date of each court event seen
+# so far, keyed by event id. No summaries or descriptions are written to disk.
+_SYNC_STATE_PATH = 'data/calendar_sync.json'
+_sync_state_lock = threading.Lock()
+
+# Sub-requests per Calendar batch HTTP request
+_BATCH_SIZE = 50
+
+# Retries for a batch call, or the sub-requests in it, rejected with a
+# rate-limit or server error
+_BATCH_RETRIES = 3
+_RETRYABLE_STATUSES = (429, 500, 502, 503, 504)
+_MAX_BACKOFF = 32  # seconds
+
+# Calendar API write pacing: sustained requests per second and burst size
+_API_RATE = 10
+_API_BURST = 20
+
+# Batch calls kept in flight at once, each on its own connection
+_MAX_CONCURRENT_BATCHES = 4
+
+# Socket timeout for Calendar API calls
+_HTTP_TIMEOUT = 30  # seconds
+
+# Credentials already loaded this process, keyed by token path
+_creds_cache: Dict[str, object] = {}
+
+# Per-thread Calendar services and authorized connections for concurrent batch calls
+_thread_state = threading.local()
+
+class TokenBucket:
+    """Thread-safe token bucket that paces API requests to a sustained rate"""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until one request may be sent"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+# Shared by every batch call, including ones running on worker threads
+_rate_limiter = TokenBucket(rate=_API_RATE, capacity=_API_BURST)
+
+# Long-lived batch workers, so each keeps its keep-alive connection (see
+# _thread_http) warm across calls instead of reconnecting every time
+_batch_executor = ThreadPoolExecutor(
+    max_workers=_MAX_CONCURRENT_BATCHES, thread_name_prefix='calendar-batch'
+)
+
+def _is_court_event(summary: str, description: str) -> bool:
+    """Check whether an event looks like one of our court hearing events"""
+    return bool(_COURT_SUMMARY_RE.search(summary) or _COURT_DESCRIPTION_RE.search(description))
+
+def _build_calendar_service(creds):
+    """
+    Build a Calendar API client whose requests share one keep-alive connection.
+    Uses the discovery document bundled with google-api-python-client, so no
+    discovery fetch or discovery-cache lookup happens here.
+    """
+    http = AuthorizedHttp(creds, http=httplib2.Http(timeout=_HTTP_TIMEOUT))
+    return build('calendar', 'v3', http=http, static_discovery=True, cache_discovery=False)
+
+def _get_service(creds):
+    """Calendar service for the calling thread, rebuilt only when the credentials change"""
+    cached = getattr(_thread_state, 'service', None)
+    if cached is None or cached[0] is not creds:
+        cached = (creds, _build_calendar_service(creds))
+        _thread_state.service = cached
+    return cached[1]
+
+def _event_cino(event: Dict) -> Optional[str]:
+    """Return the CINO stored on an event created by this app, if any"""
+    return event.get('extendedProperties', {}).get('private', {}).get('cino')
+
+def _iter_event_pages(service, calendar_id: str, item_fields: str, page_size: int = _MAX_PAGE_SIZE, **filters):
+    """Yield each page of events.list results, passing filters through to the API"""
+    page_token = None
+    while True:
+        events_result = service.events().list(
+            calendarId=calendar_id,
+            pageToken=page_token,
+            maxResults=page_size,
+            singleEvents=True,
+            fields=f'nextPageToken,items({item_fields})',
+            **filters
+        ).execute()
+
+        yield events_result.get('items', [])
+
+        page_token = events_result.get('nextPageToken')
+        if not page_token:
+            break
+
+def _iter_tagged_court_events(service, calendar_id='primary'):
+    """Yield events tagged with our source property, filtered by the API"""
+    for page in _iter_event_pages(
+        service, calendar_id, 'id,summary,start,extendedProperties',
+        privateExtendedProperty=f'source={_EVENT_SOURCE}'
+    ):
+        yield from page
+
+def _sync_account_key(creds) -> str:
+    """Short stable id for the signed-in account, so sync state is never shared between accounts"""
+    identity = f"{getattr(creds, 'client_id', '')}:{getattr(creds, 'refresh_token', '') or ''}"
+    return hashlib.sha256(identity.encode('utf-8')).hexdigest()[:16]
+
+def _lookback_date() -> str:
+    """Earliest YYYY-MM-DD start date considered by the duplicate lookup"""
+    start = datetime.date.today() - datetime.timedelta(days=_EXISTING_EVENTS_LOOKBACK_DAYS)
+    return start.isoformat()
+
+def _load_sync_state() -> Dict:
+    """Read the saved incremental-sync state, or start fresh if it is missing or unreadable"""
+    try:
+        with open(_SYNC_STATE_PATH, 'r', encoding='utf-8') as state_file:
+            return json.load(state_file)
+    except (OSError, ValueError):
+        return {}
+
+def _save_sync_state(state: Dict) -> None:
+    """Atomically replace the saved incremental-sync state"""
+    try:
+        os.makedirs(os.path.dirname(_SYNC_STATE_PATH), exist_ok=True)
+        temp_path = _SYNC_STATE_PATH + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as state_file:
+            json.dump(state, state_file)
+        os.replace(temp_path, _SYNC_STATE_PATH)
+    except OSError as save_error:
+        print(f"⚠️ Could not save calendar sync state: {save_error}")
+
+def _iter_event_changes(service, calendar_id: str, sync_token: Optional[str]):
+    """
+    Page through events.list, incrementally when a sync token is given.
+    Yields (changed events, next sync token) per page, cancelled events
+    included; the token is only set on the last page.
+    """
+    params = {
+        'calendarId': calendar_id,
+        'maxResults': _MAX_PAGE_SIZE,
+        'singleEvents': True,
+        'fields': 'nextPageToken,nextSyncToken,items(id,status,summary,description,start,extendedProperties)'
+    }
+    if sync_token:
+        params['syncToken'] = sync_token
+
+    page_token = None
+    while True:
+        events_result = service.events().list(pageToken=page_token, **params).execute()
+        page_token = events_result.get('nextPageToken')
+        yield events_result.get('items', []), None if page_token else events_result.get('nextSyncToken')
+        if not page_token:
+            return
+
+@functools.lru_cache(maxsize=1024)
+def _normalize_event_date(value: str) -> Optional[str]:
+    """
+    Return a hearing date string as YYYY-MM-DD, or None if no known layout matches.
+    Cached because many cases share the same hearing date.
+    """
+    if _ISO_DATE_RE.fullmatch(value):
+        # The layout matched; still reject impossible dates such as 2024-02-30
+        try:
+            datetime.date.fromisoformat(value)
+        except ValueError:
+            return None
+        return value
+    for date_format in _DATE_FORMATS:
+        try:
+            return datetime.datetime.strptime(value, date_format).strftime('%Y-%m-%d')
+        except ValueError:
+            continue
+    return None
+
+def _chunks(items: List, size: int):
+    """Yield consecutive slices of at most size items"""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+def _thread_http(creds):
+    """AuthorizedHttp owned by the calling thread; httplib2 connections are not thread-safe"""
+    http = getattr(_thread_state, 'http', None)
+    if http is None or http.credentials is not creds:
+        http = AuthorizedHttp(creds, http=httplib2.Http(timeout=_HTTP_TIMEOUT))
+        _thread_state.http = http
+    return http
+
+def _is_rate_limited(error) -> bool:
+    """True for 429 responses and 403 rateLimitExceeded/userRateLimitExceeded ones"""
+    if not isinstance(error, HttpError):
+        return False
+    if error.resp.status == 429:
+        return True
+    return error.resp.status == 403 and b'ratelimitexceeded' in (error.content or b'').lower()
+
+def _backoff_delay(attempt: int, error: Optional[HttpError]) -> float:
+    """Honour Retry-After when the server sent one, else exponential backoff with jitter"""
+    retry_after = error.resp.get('retry-after') if error is not None else None
+    if retry_after and retry_after.isdigit():
+        return float(retry_after)
+    return min(_MAX_BACKOFF, 2 ** attempt) + random.uniform(0, 1)
+
+def _execute_batch(service, requests: List[Tuple[str, object]], on_result, http=None) -> None:
+    """
+    Send (request_id, request) pairs as one batch HTTP request.
+    on_result(request_id, response, exception) is called per sub-request.
+    Sub-requests are paced by the shared token bucket; a rejected batch
+    (429/5xx) or rate-limited sub-requests are retried with backoff.
+    """
+    pending = list(requests)
+    for attempt in range(_BATCH_RETRIES + 1):
+        requests_by_id = dict(pending)
+        throttled = []
+        throttle_error = None
+
+        def handle_result(request_id, response, exception):
+            nonlocal throttle_error
+            if attempt < _BATCH_RETRIES and _is_rate_limited(exception):
+                throttled.append((request_id, requests_by_id[request_id]))
+                throttle_error = exception
+            else:
+                on_result(request_id, response, exception)
+
+        batch = service.new_batch_http_request(callback=handle_result)
+        for request_id, request in pending:
+            _rate_limiter.acquire()
+            batch.add(request, request_id=request_id)
+        try:
+            batch.execute(http=http)
+        except HttpError as error:
+            retryable = error.resp.status in _RETRYABLE_STATUSES or _is_rate_limited(error)
+            if not retryable or attempt == _BATCH_RETRIES:
+                raise
+            throttled, throttle_error = pending, error
+
+        if not throttled:
+            return
+        pending = throttled
+        delay = _backoff_delay(attempt, throttle_error)
+        print(f"⏳ {len(pending)} requests got HTTP {throttle_error.resp.status}, retrying in {delay:.1f}s...")
+        time.sleep(delay)
+
+def _run_batches(service, creds, batches: List[List[Tuple[str, object]]], on_result, on_batch_done) -> None:
+    """
+    Execute batches of (request_id, request) pairs concurrently.
+    on_result and on_batch_done(request_ids, error) are serialized under one
+    lock, so callers can update plain counters from them.
+    """
+    lock = threading.Lock()
+
+    def locked_result(request_id, response, exception):
+        with lock:
+            on_result(request_id, response, exception)
+
+    def run(requests):
+        error = None
+        try:
+            _execute_batch(service, requests, locked_result, http=_thread_http(creds))
+        except Exception as batch_error:
+            error = batch_error
+        with lock:
+            on_batch_done([request_id for request_id, _ in requests], error)
+
+    list(_batch_executor.map(run, batches))
+
+def _run_delete_batches(service, creds, calendar_id: str, event_ids: List[str], on_result, on_batch_done) -> None:
+    """Delete events _BATCH_SIZE per batch call, several batch calls at a time"""
+    batches = [
+        [(event_id, service.events().delete(calendarId=calendar_id, eventId=event_id))
+         for event_id in chunk]
+        for chunk in _chunks(list(event_ids), _BATCH_SIZE)
+    ]
+    _run_batches(service, creds, batches, on_result, on_batch_done)
+
+def _load_token(token_path: str):
+    """Load saved credentials, falling back to a token pickled by older versions"""
+    if os.path.exists(token_path):
+        with open(token_path, 'r', encoding='utf-8') as token_file:
+            return Credentials.from_authorized_user_info(json.load(token_file), SCOPES)
+
+    legacy_path = os.path.splitext(token_path)[0] + '.pickle'
+    if legacy_path != token_path and os.path.exists(legacy_path):
+        import pickle
+        with open(legacy_path, 'rb') as token_file:
+            creds = pickle.load(token_file)
+        print(f"🔄 Migrating pickled token {legacy_path} to {token_path}")
+        return creds
+
+    return None
+
 def google_calendar_authenticate(
-    token_path: str = 'data/token_calendar.pickle',
+    token_path: str = 'data/token_calendar.json',
     creds_path: str = 'data/credentials.json',
     port: int = 56585
 ):
     """
     Authenticate and return Google Calendar API credentials.
     """
-    creds = None
+    creds = _creds_cache.get(token_path)
+    if creds and creds.valid:
+        return creds
+
     # Load existing token
-    if os.path.exists(token_path):
+    if not creds:
         try:
-            with open(token_path, 'rb') as token_file:
-                creds = pickle.load(token_file)
-            print("✅ Loaded existing credentials")
+            creds = _load_token(token_path)
+            if creds:
+                print("✅ Loaded existing credentials")
         except Exception as e:
             print(f"⚠️ Error loading token: {e}")
             # Delete corrupted token
-            os.remove(token_path)
+            if os.path.exists(token_path):
+                os.remove(token_path)
             creds = None
 
     # Check if credentials need refresh or are invalid
@@ -68,46 +424,111 @@ def google_calendar_authenticate(
     # Save the credentials for the next run
     try:
         os.makedirs(os.path.dirname(token_path), exist_ok=True)
-        with open(token_path, 'wb') as token_file:
-            pickle.dump(creds, token_file)
+        with open(token_path, 'w', encoding='utf-8') as token_file:
+            token_file.write(creds.to_json())
         print("✅ Credentials saved successfully")
     except Exception as save_error:
         print(f"⚠️ Could not save credentials: {save_error}")
 
+    _creds_cache[token_path] = creds
     return creds
 
-def get_existing_court_events(service, calendar_id='primary'):
+def _is_existing_court_event(event: Dict) -> bool:
+    """Broader court-event check used when matching cases to existing events"""
+    summary = (event.get('summary', '') or '').lower()
+    description = event.get('description', '') or ''
+    description_lower = description.lower()
+
+    # Enhanced court event detection
+    return bool(
+        # Title patterns
+        ' vs ' in summary or
+        ' v. ' in summary or
+        ' v ' in summary or
+        'case ' in summary or
+        # Description patterns
+        'case no:' in description_lower or
+        'court/judge:' in description_lower or
+        'next stage:' in description_lower or
+        'case type:' in description_lower or
+        # Look for formatted case numbers like "PIL/123/2024"
+        re.search(r'\w+/\d+/\d{4}', description) or
+        # Look for petitioner vs respondent pattern in description
+        ' vs ' in description_lower
+    )
+
+def _is_recent(entry: Dict, cutoff: str) -> bool:
+    """Whether a known court event falls inside the duplicate lookup window"""
+    return not entry['date'] or entry['date'] >= cutoff
+
+def _apply_event_changes(events: Dict, changes: List[Dict], cutoff: str) -> None:
+    """Fold one page of changed events into the {id: entry} map of known court events"""
+    for event in changes:
+        if event.get('status') == 'cancelled' or not _is_existing_court_event(event):
+            events.pop(event['id'], None)
+            continue
+        description = event.get('description', '') or ''
+        cino = _event_cino(event)
+        if not cino:
+            cino_match = _CINO_RE.search(description)
+            cino = cino_match.group(1) if cino_match else None
+        start = event.get('start', {})
+        entry = {'cino': cino, 'date': (start.get('date') or start.get('dateTime') or '')[:10]}
+        if not cino and _is_recent(entry, cutoff):
+            entry['description'] = description
+        events[event['id']] = entry
+
+def iter_existing_court_events(service, calendar_id='primary', account=''):
+    """
+    Yield recent court events for duplicate matching as {'id', 'cino', 'date'}
+    dicts; recent events without a CINO also carry the 'description' they
+    were fetched with, for case-number matching.
+    The id, CINO and start date of each court event are kept in
+    data/calendar_sync.json with the calendar's sync token, under the given
+    account key, so repeat runs only fetch what changed since the last one.
+    An expired token (HTTP 410) falls back to a full sync. A recent event
+    without a CINO can only be matched on its description, which is never
+    saved, so while one is known the token is not kept and the next run syncs
+    in full. Older events are never matched, so they do not hold the token back.
+    """
+    state_key = f"{account}:{calendar_id}"
+    cutoff = _lookback_date()
+    with _sync_state_lock:
+        state = _load_sync_state()
+        calendar_state = state.get(state_key) or {}
+        sync_token = calendar_state.get('sync_token')
+        events = calendar_state.get('events', {}) if sync_token else {}
+        next_sync_token = None
+
+        try:
+            for changes, next_sync_token in _iter_event_changes(service, calendar_id, sync_token):
+                _apply_event_changes(events, changes, cutoff)
+        except HttpError as error:
+            if error.resp.status != 410 or not sync_token:
+                raise
+            print("🔄 Calendar sync token expired, running a full sync...")
+            events = {}
+            for changes, next_sync_token in _iter_event_changes(service, calendar_id, None):
+                _apply_event_changes(events, changes, cutoff)
+
+        # Drop entries for other accounts and any pre-existing full-event state
+        state = {key: value for key, value in state.items() if key.startswith(f"{account}:")}
+        if next_sync_token and all(
+            entry['cino'] for entry in events.values() if _is_recent(entry, cutoff)
+        ):
+            state[state_key] = {'sync_token': next_sync_token, 'events': events}
+        else:
+            state.pop(state_key, None)
+        _save_sync_state(state)
+
+    for event_id, entry in events.items():
+        if _is_recent(entry, cutoff):
+            yield dict(entry, id=event_id)
+
+def get_existing_court_events(service, calendar_id='primary', account=''):
     """Get existing court events to avoid duplicates"""
     try:
-        events = []
-        page_token = None
-        
-        while True:
-            events_result = service.events().list(
-                calendarId=calendar_id,
-                pageToken=page_token,
-                maxResults=2500,
-                singleEvents=True,
-                orderBy='startTime'
-            ).execute()
-            
-            batch_events = events_result.get('items', [])
-            for event in batch_events:
-                summary = event.get('summary', '') or ''
-                description = event.get('description', '') or ''
-                
-                # Check if it's a court event
-                if (' vs ' in summary.lower() or 
-                    'state_name:' in description.lower() or
-                    'cino:' in description.lower()):
-                    events.append(event)
-            
-            page_token = events_result.get('nextPageToken')
-            if not page_token:
-                break
-        
-        return events
-        
+        return list(iter_existing_court_events(service, calendar_id, account))
     except Exception as e:
         print(f"Error getting existing events: {e}")
         return []
@@ -115,7 +536,7 @@ def get_existing_court_events(service, calendar_id='primary'):
 def create_google_calendar_events_for_cases(
     cases_data,
     calendar_id='primary',
-    token_path='data/token_calendar.pickle',
+    token_path='data/token_calendar.json',
     creds_path='data/credentials.json',
     port=56585,
     progress_callback=None,
@@ -143,7 +564,7 @@ def create_google_calendar_events_for_cases(
 
         # Test the credentials before proceeding
         try:
-            service = build('calendar', 'v3', credentials=creds)
+            service = _get_service(creds)
             test_result = service.calendars().get(calendarId=calendar_id).execute()
             print("✅ Calendar service authenticated and tested successfully")
         except Exception as auth_test_error:
@@ -157,11 +578,10 @@ def create_google_calendar_events_for_cases(
             }
 
         # Filter cases with valid dates
-        valid_cases = []
-        for case in cases_data:
-            if (case.get('date_next_list') and 
-                case['date_next_list'] not in ['Not set', '', None, 'Not scheduled']):
-                valid_cases.append(case)
+        valid_cases = [
+            case for case in cases_data
+            if case.get('date_next_list') not in _NO_HEARING_DATES
+        ]
         
         print(f"📅 Filtered to {len(valid_cases)} cases with valid dates from {len(cases_data)} total")
         
@@ -184,34 +604,33 @@ def create_google_calendar_events_for_cases(
         # FIXED: Get existing events with better matching
         print("📋 Checking for existing events...")
         try:
-            existing_events = get_existing_court_events_with_cino_mapping(service, calendar_id)
+            # Keys map to event ids only, so the streamed events can be dropped
             existing_events_map = {}
             
             # Create a more robust mapping with multiple fallback strategies
-            for event in existing_events:
+            for event in iter_existing_court_events(service, calendar_id, _sync_account_key(creds)):
+                event_id = event['id']
                 description = event.get('description', '')
-                summary = event.get('summary', '')
                 
-                # Strategy 1: Extract formatted case number (PIL/123/2024 format)
+                # Strategy 1: CINO from our private tag, or an older "CINO:" description line
+                event_cino = event['cino']
+                if event_cino:
+                    existing_events_map[f"cino_{event_cino}"] = event_id
+                
+                # Strategy 2: Extract formatted case number (PIL/123/2024 format)
                 case_no_match = re.search(r'Case No:\s*([^\n\r]+)', description, re.IGNORECASE)
                 if case_no_match:
                     case_no = case_no_match.group(1).strip()
-                    existing_events_map[f"case_no_{case_no}"] = event
-                    print(f"📍 Mapped by Case No: {case_no} -> Event ID {event.get('id', 'Unknown')[:10]}...")
-                
-                # Strategy 2: Extract parties from summary (Petitioner vs Respondent)
-                if ' vs ' in summary.lower():
-                    parties_key = summary.lower().replace(' ', '_')
-                    existing_events_map[f"parties_{parties_key}"] = event
-                    print(f"📍 Mapped by Parties: {summary[:30]}... -> Event ID {event.get('id', 'Unknown')[:10]}...")
+                    existing_events_map[f"case_no_{case_no}"] = event_id
+                    logger.debug("Mapped by Case No: %s -> Event ID %s...", case_no, event_id[:10])
                 
                 # Strategy 3: Extract type/reg_no/reg_year pattern
                 type_reg_match = re.search(r'(\w+)/(\d+)/(\d{4})', description)
                 if type_reg_match:
                     type_name, reg_no, reg_year = type_reg_match.groups()
                     type_reg_key = f"{type_name}/{reg_no}/{reg_year}"
-                    existing_events_map[f"type_reg_{type_reg_key}"] = event
-                    print(f"📍 Mapped by Type/Reg: {type_reg_key} -> Event ID {event.get('id', 'Unknown')[:10]}...")
+                    existing_events_map[f"type_reg_{type_reg_key}"] = event_id
+                    logger.debug("Mapped by Type/Reg: %s -> Event ID %s...", type_reg_key, event_id[:10])
 
             print(f"📊 Created mapping for {len(existing_events_map)} existing court events with multiple strategies")
 
@@ -219,13 +638,52 @@ def create_google_calendar_events_for_cases(
             print(f"⚠️ Warning: Could not check existing events: {existing_error}")
             existing_events_map = {}
 
+        # Update/insert requests, sent in concurrent batch calls once every case is prepared
+        batch_requests = []
+        pending = {}
+        processed_count = 0
+
+        def record_result(request_id, response, exception):
+            nonlocal created_count, updated_count, failed_count
+            action, event_title, event_date, case_no = pending[request_id]
+            if exception is not None:
+                print(f"❌ Failed to {action} event for case {case_no}: {exception}")
+                failed_count += 1
+            elif action == 'update':
+                logger.debug("Updated event #%d: %s on %s", updated_count + 1, event_title, event_date)
+                updated_count += 1
+            else:
+                logger.debug("Created event #%d: %s on %s", created_count + 1, event_title, event_date)
+                created_count += 1
+
+        def finish_batch(request_ids, batch_error):
+            nonlocal failed_count, processed_count
+            if batch_error is not None:
+                print(f"❌ Batch request failed for {len(request_ids)} events: {batch_error}")
+                failed_count += len(request_ids)
+            processed_count += len(request_ids)
+            print(f"📦 Batch done: {processed_count}/{len(valid_cases)} processed "
+                  f"({created_count} created, {updated_count} updated, {failed_count} failed)")
+
+            # Progress callback
+            if progress_callback:
+                progress_callback({
+                    'processed': processed_count,
+                    'total': len(valid_cases),
+                    'created': created_count,
+                    'updated': updated_count,
+                    'failed': failed_count,
+                    'skipped': skipped_count,
+                    'current_case': pending[request_ids[-1]][1]
+                })
+
         # Process each valid case
         for i, case in enumerate(valid_cases):
             try:
                 cino = case.get('cino', '').strip()
                 case_no = case.get('case_no', '').strip()
                 
-                print(f"\n📝 Processing case {i+1}/{len(valid_cases)}: CINO {cino}")
+                logger.debug("Processing case %d/%d: CINO %s", i + 1, len(valid_cases), cino)
                 
                 # Create event summary
                 petitioner = case.get('petparty_name', '').strip()
@@ -245,14 +703,8 @@ def create_google_calendar_events_for_cases(
                 # Convert date format with better error handling
                 try:
                     if isinstance(next_date, str):
-                        for date_format in ['%Y-%m-%d', '%d/%m/%Y', '%d-%m-%Y', '%Y/%m/%d']:
-                            try:
-                                date_obj = datetime.datetime.strptime(next_date, date_format)
-                                event_date = date_obj.strftime('%Y-%m-%d')
-                                break
-                            except ValueError:
-                                continue
-                        else:
+                        event_date = _normalize_event_date(next_date)
+                        if event_date is None:
                             print(f"⚠️ Invalid date format for case {case_no}: {next_date}")
                             skipped_count += 1
                             continue
@@ -263,16 +715,6 @@ def create_google_calendar_events_for_cases(
                     skipped_count += 1
                     continue
 
-                # FIXED: Create event description with proper user side handling
-                description_parts = []
-
-                # FIXED: Get user side properly - check for actual value
-                user_side = case.get('user_side', '').strip()
-                # if user_side and user_side.lower() not in ['', 'not set', 'none', 'null']:
-                #     description_parts.append(f"User Side: {user_side.title()}")
-                # else:
-                #     description_parts.append("User Side: Not set")
-
                 # FIXED: Format case number as type_name/reg_no/reg_year
                 type_name = case.get('type_name', '').strip()
                 reg_no = case.get('reg_no', '')
@@ -284,35 +726,17 @@ def create_google_calendar_events_for_cases(
                     # Fallback to original case number if components are missing
                     formatted_case_no = case.get('case_no', '')
 
-                description_parts.append(f"Case No: {formatted_case_no}")
-                description_parts.append(f"Case Type: {case.get('case_type_name', 'N/A')}")
-                description_parts.append(f"Court/Judge: {case.get('court_no_desg_name', 'N/A')}")
-                description_parts.append(f"Next Stage: {case.get('purpose_name', 'N/A')}")
-                # description_parts.append(f"CINO: {case.get('cino', '')}")
-                # description_parts.append(f"Establishment: {case.get('establishment_name', 'N/A')}")
-
-                court_info = case.get('court_no_desg_name', 'N/A')
-
-                # FIXED: Location handling
-                state = case.get('state_name', '').strip()
-                district = case.get('district_name', '').strip()
-                if state and district:
-                    location = f"{district}, {state}"
-                elif state:
-                    location = state
-                elif district:
-                    location = district
-                else:
-                    location = "N/A"
-                # description_parts.append(f"Location: {location}")
+                event_description = _DESCRIPTION_TEMPLATE.format(
+                    case_no=formatted_case_no,
+                    case_type=case.get('case_type_name', 'N/A'),
+                    court=case.get('court_no_desg_name', 'N/A'),
+                    stage=case.get('purpose_name', 'N/A')
+                )
 
                 # FIXED: Notes handling with proper formatting
                 user_notes = case.get('user_notes', '').strip()
                 if user_notes:
-                    description_parts.append("Notes:")
-                    description_parts.append(user_notes)
-
-                event_description = '\n'.join(description_parts)
+                    event_description += f"\nNotes:\n{user_notes}"
 
                 # Create event body
                 event_body = {
@@ -332,78 +756,58 @@ def create_google_calendar_events_for_cases(
                             {'method': 'email', 'minutes': 24 * 60},
                             {'method': 'popup', 'minutes': 60}
                         ]
+                    },
+                    'extendedProperties': {
+                        'private': {'source': _EVENT_SOURCE, 'cino': cino}
                     }
                 }
 
                 # FIXED LOGIC: Check if event exists and update or create
-                existing_event = None
+                existing_event_id = None
                 match_strategy = None
 
-                # Strategy 1: Match by formatted case number
+                # Strategy 1: Match by CINO, which is unique per case
                 formatted_case_no = f"{type_name}/{reg_no}/{reg_year}" if type_name and reg_no and reg_year else case_no
-                if f"case_no_{formatted_case_no}" in existing_events_map:
-                    existing_event = existing_events_map[f"case_no_{formatted_case_no}"]
+                if cino and f"cino_{cino}" in existing_events_map:
+                    existing_event_id = existing_events_map[f"cino_{cino}"]
+                    match_strategy = f"CINO: {cino}"
+
+                # Strategy 2: Match by formatted case number
+                elif f"case_no_{formatted_case_no}" in existing_events_map:
+                    existing_event_id = existing_events_map[f"case_no_{formatted_case_no}"]
                     match_strategy = f"Case No: {formatted_case_no}"
 
-                # Strategy 2: Match by original case number
+                # Strategy 3: Match by original case number
                 elif f"case_no_{case_no}" in existing_events_map:
-                    existing_event = existing_events_map[f"case_no_{case_no}"]
+                    existing_event_id = existing_events_map[f"case_no_{case_no}"]
                     match_strategy = f"Original Case No: {case_no}"
 
-                # Strategy 3: Match by parties (petitioner vs respondent)
-                # elif petitioner and respondent:
-                #     parties_key = f"{petitioner} vs {respondent}".lower().replace(' ', '_')
-                #     if f"parties_{parties_key}" in existing_events_map:
-                #         existing_event = existing_events_map[f"parties_{parties_key}"]
-                #         match_strategy = f"Parties: {petitioner} vs {respondent}"
-
                 # Strategy 4: Match by type/reg pattern
                 elif type_name and reg_no and reg_year:
                     type_reg_key = f"{type_name}/{reg_no}/{reg_year}"
                     if f"type_reg_{type_reg_key}" in existing_events_map:
-                        existing_event = existing_events_map[f"type_reg_{type_reg_key}"]
+                        existing_event_id = existing_events_map[f"type_reg_{type_reg_key}"]
                         match_strategy = f"Type/Reg: {type_reg_key}"
                 
-                # Try to find existing event by CINO first
-                elif cino in existing_events_map:
-                    existing_event = existing_events_map[cino]
-                    print(f"🔍 Found existing event by CINO: {cino}")
-                
-                # Try backup matching by case number
-                elif f"case_no_{case_no}" in existing_events_map:
-                    existing_event = existing_events_map[f"case_no_{case_no}"]
-                    print(f"🔍 Found existing event by Case No: {case_no}")
-                
-                if existing_event:
-                    print(f"🔍 Found existing event using {match_strategy}")
-                     # UPDATE existing event
-                    event_id = existing_event['id']
-                    try:
-                        print(f"🔄 Updating existing event: {event_title} (Strategy: {match_strategy})")
-                        updated_event = service.events().update(
-                            calendarId=calendar_id,
-                            eventId=event_id,
-                            body=event_body
-                        ).execute()
-                        print(f"✅ Updated event #{updated_count + 1}: {event_title} on {event_date}")
-                        updated_count += 1
-                    except Exception as update_error:
-                        print(f"❌ Failed to update event for case {case_no}: {update_error}")
-                        failed_count += 1
+                request_id = str(i)
+                if existing_event_id:
+                    # UPDATE existing event
+                    logger.debug("Updating existing event: %s (Strategy: %s)", event_title, match_strategy)
+                    request = service.events().update(
+                        calendarId=calendar_id,
+                        eventId=existing_event_id,
+                        body=event_body
+                    )
+                    pending[request_id] = ('update', event_title, event_date, case_no)
                 else:
                     # CREATE new event
-                    try:
-                        print(f"➕ Creating new event: {event_title} (No existing match found)")
-                        created_event = service.events().insert(
-                            calendarId=calendar_id,
-                            body=event_body
-                        ).execute()
-                        print(f"✅ Created event #{created_count + 1}: {event_title} on {event_date}")
-                        created_count += 1
-                    except Exception as create_error:
-                        print(f"❌ Failed to create event for case {case_no}: {create_error}")
-                        failed_count += 1
-                    print(f"➕ No existing event found for case {case_no}, will create new")
+                    logger.debug("Creating new event: %s (No existing match found)", event_title)
+                    request = service.events().insert(
+                        calendarId=calendar_id,
+                        body=event_body
+                    )
+                    pending[request_id] = ('create', event_title, event_date, case_no)
+                batch_requests.append((request_id, request))
 
                 # if existing_event:
                 #     # UPDATE existing event
@@ -438,26 +842,16 @@ def create_google_calendar_events_for_cases(
                 #         print(f"❌ Failed to create event for case {case_no}: {create_error}")
                 #         failed_count += 1
 
-                # Progress callback
-                if progress_callback:
-                    progress_callback({
-                        'processed': i + 1,
-                        'total': len(valid_cases),
-                        'created': created_count,
-                        'updated': updated_count,
-                        'failed': failed_count,
-                        'skipped': skipped_count,
-                        'current_case': event_title
-                    })
-
-                # Rate limiting to avoid API quotas
-                import time
-                time.sleep(0.3)
-
             except Exception as case_error:
                 print(f"❌ Error processing case {case.get('case_no', 'Unknown')}: {case_error}")
                 failed_count += 1
 
+        processed_count = len(valid_cases) - len(batch_requests)
+        _run_batches(
+            service, creds, list(_chunks(batch_requests, _BATCH_SIZE)),
+            record_result, finish_batch
+        )
+
         # Final results
         result = {
             'created': created_count,
@@ -486,119 +880,9 @@ def create_google_calendar_events_for_cases(
             'received_all_data': True
         }
 
-def get_existing_court_events_with_cino_mapping(service, calendar_id='primary'):
-    """
-    Get existing court events with better CINO extraction for mapping.
-    ENHANCED: Better pattern matching and case number fallback.
-    """
-    try:
-        events = []
-        page_token = None
-        print("📋 Fetching existing court events for mapping...")
-
-        while True:
-            events_result = service.events().list(
-                calendarId=calendar_id,
-                pageToken=page_token,
-                maxResults=2500,
-                singleEvents=True,
-                orderBy='startTime'
-            ).execute()
-
-            batch_events = events_result.get('items', [])
-            print(f"📊 Checking {len(batch_events)} events in this batch...")
-
-            for event in batch_events:
-                summary = event.get('summary', '') or ''
-                description = event.get('description', '') or ''
-
-                # Enhanced court event detection
-                is_court_event = (
-                    # Title patterns
-                    ' vs ' in summary.lower() or
-                    ' v. ' in summary.lower() or
-                    ' v ' in summary.lower() or
-                    'case ' in summary.lower() or
-                    # Description patterns - ENHANCED
-                    'case no:' in description.lower() or
-                    'court/judge:' in description.lower() or
-                    'next stage:' in description.lower() or
-                    'case type:' in description.lower() or
-                    # Look for formatted case numbers like "PIL/123/2024"
-                    re.search(r'\w+/\d+/\d{4}', description) or
-                    # Look for petitioner vs respondent pattern in description
-                    ' vs ' in description.lower()
-                )
-
-                if is_court_event:
-                    events.append({
-                        'id': event.get('id'),
-                        'summary': summary,
-                        'description': description,
-                        'start': event.get('start', {}),
-                        'end': event.get('end', {}),
-                        'reminders': event.get('reminders', {})
-                    })
-
-            page_token = events_result.get('nextPageToken')
-            if not page_token:
-                break
-
-        print(f"📈 Total court events found: {len(events)}")
-        return events
-
-    except Exception as e:
-        print(f"❌ Error getting existing court events: {e}")
-        return []
-
-def get_existing_court_events_detailed(service, calendar_id='primary'):
-    """Get existing court events with detailed information for updating"""
-    try:
-        events = []
-        page_token = None
-        
-        while True:
-            events_result = service.events().list(
-                calendarId=calendar_id,
-                pageToken=page_token,
-                maxResults=2500,
-                singleEvents=True,
-                orderBy='startTime'
-            ).execute()
-            
-            batch_events = events_result.get('items', [])
-            
-            for event in batch_events:
-                summary = event.get('summary', '') or ''
-                description = event.get('description', '') or ''
-                
-                # Check if it's a court event
-                if (' vs ' in summary.lower() or
-                    'cino:' in description.lower() or
-                    'case no:' in description.lower()):
-                    events.append({
-                        'id': event.get('id'),
-                        'summary': summary,
-                        'description': description,
-                        'start': event.get('start', {}),
-                        'end': event.get('end', {}),
-                        'reminders': event.get('reminders', {})
-                    })
-            
-            page_token = events_result.get('nextPageToken')
-            if not page_token:
-                break
-        
-        return events
-        
-    except Exception as e:
-        print(f"Error getting detailed existing events: {e}")
-        return []
-
-
 def get_court_events_for_deletion(
     calendar_id: str = 'primary',
-    token_path: str = 'data/token_calendar.pickle',
+    token_path: str = 'data/token_calendar.json',
     creds_path: str = 'data/credentials.json',
     port: int = 56585,
     max_results: int = 2500
@@ -614,11 +898,13 @@ def get_court_events_for_deletion(
             print("âŒ Authentication failed!")
             return []
             
-        service = build('calendar', 'v3', credentials=creds)
+        service = _get_service(creds)
         print("âœ“ Calendar service initialized")
 
         court_events = []
-        page_token = None
+        pages = _iter_event_pages(
+            service, calendar_id, 'id,summary,description,start', min(max_results, _MAX_PAGE_SIZE)
+        )
         total_events_scanned = 0
         batch_count = 0
 
@@ -627,15 +913,9 @@ def get_court_events_for_deletion(
             print(f"ðŸ“‹ Scanning batch #{batch_count}...")
             
             try:
-                events_result = service.events().list(
-                    calendarId=calendar_id,
-                    pageToken=page_token,
-                    maxResults=max_results,
-                    singleEvents=True,
-                    orderBy='startTime',
-                ).execute()
-                
-                events = events_result.get('items', [])
+                events = next(pages, None)
+                if events is None:
+                    break
                 batch_court_events = 0
                 
                 print(f"ðŸ“Š Batch #{batch_count}: Found {len(events)} total events")
@@ -645,18 +925,7 @@ def get_court_events_for_deletion(
                     summary = event.get('summary', '') or ''
                     description = event.get('description', '') or ''
 
-                    # Enhanced court event detection
-                    is_court_event = (
-                        ' vs ' in summary.lower() or 
-                        ' v. ' in summary.lower() or 
-                        ' v ' in summary.lower() or
-                        'state_name:' in description.lower() or
-                        'cino:' in description.lower() or
-                        'case_no:' in description.lower() or
-                        'establishment_name:' in description.lower()
-                    )
-                    
-                    if is_court_event:
+                    if _is_court_event(summary, description):
                         court_events.append({
                             'id': event.get('id'),
                             'summary': summary,
@@ -670,10 +939,6 @@ def get_court_events_for_deletion(
                             print(f"ðŸŽ¯ Court event #{len(court_events)}: '{summary[:50]}...'")
 
                 print(f"âœ… Batch #{batch_count}: Found {batch_court_events} court events")
-                
-                page_token = events_result.get('nextPageToken')
-                if not page_token:
-                    break
                     
             except Exception as batch_error:
                 print(f"âŒ Error in batch #{batch_count}: {batch_error}")
@@ -692,7 +957,7 @@ def get_court_events_for_deletion(
 
 def delete_court_events_by_summary_or_description(
     calendar_id='primary',
-    token_path='data/token_calendar.pickle',
+    token_path='data/token_calendar.json',
     creds_path='data/credentials.json',
     port=56585,
     max_results=2500,
@@ -718,34 +983,23 @@ def delete_court_events_by_summary_or_description(
         print("âœ“ Authentication successful")
         
         # Build service
-        service = build('calendar', 'v3', credentials=creds)
+        service = _get_service(creds)
         print("âœ“ Calendar service created")
 
         deleted_count = 0
         failed_count = 0
-        page_token = None
         total_processed = 0
         loop_count = 0
 
         print("Searching for court events...")
+        pages = _iter_event_pages(
+            service, calendar_id, 'id,summary,description', min(max_results, _MAX_PAGE_SIZE)
+        )
 
         while True:
-            loop_count += 1
-            print(f"ðŸ“‹ Loop #{loop_count}: Fetching events from calendar...")
-            
             try:
-                # Fetch events with error handling
-                events_result = service.events().list(
-                    calendarId=calendar_id,
-                    pageToken=page_token,
-                    maxResults=max_results,
-                    singleEvents=True,
-                    orderBy='startTime',
-                    timeMin=None,  # Get all events (past and future)
-                ).execute()
-                
-                print(f"âœ“ API call successful for loop #{loop_count}")
-                
+                # Fetch the next page of search results with error handling
+                events = next(pages, None)
             except Exception as api_error:
                 print(f"âŒ API call failed: {api_error}")
                 return {
@@ -755,7 +1009,14 @@ def delete_court_events_by_summary_or_description(
                     'error': f'API call failed: {str(api_error)}'
                 }
 
-            events = events_result.get('items', [])
+            if events is None:
+                print("âœ… All pages processed")
+                break
+
+            loop_count += 1
+            print(f"ðŸ“‹ Loop #{loop_count}: Fetching events from calendar...")
+            print(f"âœ“ API call successful for loop #{loop_count}")
+
             print(f"ðŸ“Š Found {len(events)} total events in this batch")
 
             # Debug: Show first few events
@@ -772,53 +1033,41 @@ def delete_court_events_by_summary_or_description(
                 summary = event.get('summary', '') or ''
                 description = event.get('description', '') or ''
 
-                # More comprehensive matching
-                is_court_event = (
-                    ' vs ' in summary.lower() or 
-                    ' v. ' in summary.lower() or 
-                    ' v ' in summary.lower() or
-                    'state_name:' in description.lower() or
-                    'state_name ' in description.lower() or
-                    'cino:' in description.lower() or
-                    'case_no:' in description.lower()
-                )
-                
-                if is_court_event:
+                if _is_court_event(summary, description):
                     to_delete.append(event)
                     if len(to_delete) <= 3:  # Debug first few matches
                         print(f"ðŸŽ¯ Match found: '{summary}'")
 
             print(f"ðŸŽ¯ Found {len(to_delete)} court events to delete in this batch")
 
-            # Break if no events to delete in this batch
+            # Nothing to delete in this page
             if not to_delete:
                 print(f"â„¹ï¸ No court events found in batch #{loop_count}")
-                # Check if there are more pages
-                page_token = events_result.get('nextPageToken')
-                if not page_token:
-                    print("â„¹ï¸ No more pages to fetch")
-                    break
-                else:
-                    print(f"â„¹ï¸ Moving to next page (token: {page_token[:10]}...)")
-                    continue
+                continue
 
             # Delete events with progress tracking
             print(f"ðŸ—‘ï¸ Starting deletion of {len(to_delete)} events...")
             
-            for i, event in enumerate(to_delete):
-                event_id = event.get('id')
-                summary = event.get('summary', 'No Summary')
-                
-                try:
-                    service.events().delete(calendarId=calendar_id, eventId=event_id).execute()
-                    print(f"âœ… Deleted event #{total_processed + 1}: '{summary[:50]}...'")
+            summaries = {event.get('id'): event.get('summary', 'No Summary') for event in to_delete}
+
+            def record_result(event_id, response, delete_error):
+                nonlocal deleted_count, failed_count
+                summary = summaries[event_id]
+                if delete_error is None:
+                    logger.debug("Deleted event #%d: '%s...'", deleted_count + 1, summary[:50])
                     deleted_count += 1
-                except Exception as delete_error:
+                else:
                     print(f"âŒ Failed to delete event '{summary[:50]}...': {delete_error}")
                     failed_count += 1
-                
-                total_processed += 1
-                
+
+            def finish_batch(chunk, delete_error):
+                nonlocal failed_count, total_processed
+                if delete_error is not None:
+                    print(f"âŒ Batch delete failed for {len(chunk)} events: {delete_error}")
+                    failed_count += len(chunk)
+                total_processed += len(chunk)
+                print(f"📦 Batch done: {total_processed} processed ({deleted_count} deleted, {failed_count} failed)")
+
                 # Call progress callback if provided
                 if progress_callback:
                     try:
@@ -826,23 +1075,13 @@ def delete_court_events_by_summary_or_description(
                             'processed': total_processed,
                             'deleted': deleted_count,
                             'failed': failed_count,
-                            'current_event': summary,
+                            'current_event': summaries[chunk[-1]],
                             'batch': loop_count
                         })
                     except Exception as callback_error:
                         print(f"âš ï¸ Progress callback error: {callback_error}")
 
-                # Add small delay to avoid rate limiting
-                import time
-                time.sleep(0.1)
-
-            # Check for next page
-            page_token = events_result.get('nextPageToken')
-            if not page_token:
-                print("âœ… All pages processed")
-                break
-            else:
-                print(f"âž¡ï¸ Moving to next page...")
+            _run_delete_batches(service, creds, calendar_id, summaries, record_result, finish_batch)
 
         # Final results
         result = {
@@ -869,7 +1108,7 @@ def delete_court_events_by_summary_or_description(
 def delete_events_by_ids(
     event_ids: List[str],
     calendar_id='primary',
-    token_path='data/token_calendar.pickle',
+    token_path='data/token_calendar.json',
     creds_path='data/credentials.json',
     port=56585,
     progress_callback=None
@@ -884,34 +1123,47 @@ def delete_events_by_ids(
     Returns:
         Dictionary with deletion statistics
     """
+    # Collapse duplicate ids so no event is deleted (and 404s) twice
+    event_ids = list(dict.fromkeys(event_ids))
     if not event_ids:
         return {'deleted': 0, 'failed': 0, 'total_processed': 0}
 
     creds = google_calendar_authenticate(token_path, creds_path, port)
-    service = build('calendar', 'v3', credentials=creds)
+    service = _get_service(creds)
 
     deleted_count = 0
     failed_count = 0
-    
-    for i, event_id in enumerate(event_ids):
-        try:
-            service.events().delete(calendarId=calendar_id, eventId=event_id).execute()
-            print(f"Deleted event with ID: {event_id}")
+    processed = 0
+
+    def record_result(event_id, response, error):
+        nonlocal deleted_count, failed_count
+        if error is None:
+            logger.debug("Deleted event with ID: %s", event_id)
             deleted_count += 1
-        except Exception as e:
-            print(f"Failed to delete event with ID {event_id}: {e}")
+        else:
+            print(f"Failed to delete event with ID {event_id}: {error}")
             failed_count += 1
+    
+    def finish_batch(chunk, error):
+        nonlocal failed_count, processed
+        if error is not None:
+            print(f"Failed to delete batch of {len(chunk)} events: {error}")
+            failed_count += len(chunk)
+        processed += len(chunk)
+        print(f"Batch done: {processed}/{len(event_ids)} processed ({deleted_count} deleted, {failed_count} failed)")
         
         # Call progress callback if provided
         if progress_callback:
             progress_callback({
-                'processed': i + 1,
+                'processed': processed,
                 'total': len(event_ids),
                 'deleted': deleted_count,
                 'failed': failed_count,
-                'current_event_id': event_id
+                'current_event_id': chunk[-1]
             })
 
+    _run_delete_batches(service, creds, calendar_id, event_ids, record_result, finish_batch)
+
     result = {
         'deleted': deleted_count,
         'failed': failed_count,
@@ -934,7 +1186,9 @@ def clear_local_case_files() -> Dict[str, any]:
             'data/temp_cases.xlsx',
             'data/calendar_events_created.xlsx',
             'data/cases_data.csv',
-            'data/cases_data.xlsx'
+            'data/cases_data.xlsx',
+            _SYNC_STATE_PATH,
+            _SYNC_STATE_PATH + '.tmp'
         ]
         
         deleted_files = []
@@ -943,17 +1197,14 @@ def clear_local_case_files() -> Dict[str, any]:
         
         for file_path in files_to_delete:
             try:
-                if os.path.exists(file_path):
-                    # Get file size before deletion
-                    file_size = os.path.getsize(file_path)
-                    file_sizes[file_path] = file_size
-                    
-                    # Delete the file
-                    os.remove(file_path)
-                    deleted_files.append(file_path)
-                    print(f"ðŸ—‘ï¸ Deleted file: {file_path} ({file_size} bytes)")
-                else:
-                    print(f"â© File not found: {file_path}")
+                # One stat for the size, then unlink; a missing file raises instead
+                file_size = os.stat(file_path).st_size
+                os.unlink(file_path)
+                file_sizes[file_path] = file_size
+                deleted_files.append(file_path)
+                print(f"ðŸ—‘ï¸ Deleted file: {file_path} ({file_size} bytes)")
+            except FileNotFoundError:
+                print(f"â© File not found: {file_path}")
             except Exception as file_error:
                 failed_files.append(f"{file_path}: {str(file_error)}")
                 print(f"âŒ Failed to delete {file_path}: {file_error}")
@@ -978,7 +1229,7 @@ def clear_local_case_files() -> Dict[str, any]:
 
 def complete_system_cleanup(
     calendar_id='primary',
-    token_path='data/token_calendar.pickle',
+    token_path='data/token_calendar.json',
     creds_path='data/credentials.json',
     port=56585,
     progress_callback=None
@@ -1002,51 +1253,70 @@ def complete_system_cleanup(
             'total_success': False
         }
         
-        # Step 1: Create backup first
-        if progress_callback:
-            progress_callback({'step': 'backup', 'message': 'Creating backup...'})
-        
-        try:
-            from database import CaseDatabase
-            db = CaseDatabase()
-            backup_path = db.backup_data_before_clear()
-            cleanup_results['backup_created'] = backup_path
-            print("âœ… Backup created successfully")
-        except Exception as backup_error:
-            print(f"âš ï¸ Backup creation failed: {backup_error}")
-        
+        # The calendar deletion is network-bound and the file cleanup only
+        # touches downloaded case files, so both start right away; only the
+        # database clear has to wait for the backup of the database.
+        progress_lock = threading.Lock()
+
+        def report_progress(update):
+            if progress_callback:
+                with progress_lock:
+                    progress_callback(update)
+
+        def backup_database():
+            try:
+                from database import CaseDatabase
+                backup_path = CaseDatabase().backup_data_before_clear()
+                print("âœ… Backup created successfully")
+                return backup_path
+            except Exception as backup_error:
+                print(f"âš ï¸ Backup creation failed: {backup_error}")
+                return None
+
+        def clear_database():
+            report_progress({'step': 'database', 'message': 'Clearing database...'})
+            try:
+                from database import CaseDatabase
+                db_result = CaseDatabase().clear_all_data()
+                print(f"âœ… Database cleanup: {db_result.get('cases_deleted', 0)} cases deleted")
+                return db_result
+            except Exception as db_error:
+                print(f"âŒ Database cleanup failed: {db_error}")
+                return {'error': str(db_error)}
+
+        def clear_files():
+            report_progress({'step': 'files', 'message': 'Deleting local files...'})
+            return clear_local_case_files()
+
+        # Step 1: Create backup (runs while the calendar and file steps below proceed)
+        report_progress({'step': 'backup', 'message': 'Creating backup...'})
+
         # Step 2: Delete calendar events
-        if progress_callback:
-            progress_callback({'step': 'calendar', 'message': 'Deleting calendar events...'})
-        
-        calendar_result = delete_court_events_by_summary_or_description(
-            calendar_id, token_path, creds_path, port, 
-            progress_callback=lambda p: progress_callback({
-                'step': 'calendar', 
-                'message': f"Deleting calendar events... {p.get('processed', 0)} processed"
-            }) if progress_callback else None
-        )
+        report_progress({'step': 'calendar', 'message': 'Deleting calendar events...'})
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            calendar_future = executor.submit(
+                delete_court_events_by_summary_or_description,
+                calendar_id, token_path, creds_path, port,
+                # Pass no callback at all when nobody is listening so the
+                # deleter skips building a progress dict per event
+                progress_callback=(lambda p: report_progress({
+                    'step': 'calendar',
+                    'message': f"Deleting calendar events... {p.get('processed', 0)} processed"
+                })) if progress_callback else None
+            )
+            # Step 4: Clear local files
+            files_future = executor.submit(clear_files)
+
+            # Step 3: Clear database once it is backed up
+            cleanup_results['backup_created'] = backup_database()
+            cleanup_results['database_cleanup'] = clear_database()
+
+            calendar_result = calendar_future.result()
+            file_result = files_future.result()
+
         cleanup_results['calendar_deletion'] = calendar_result
         print(f"âœ… Calendar cleanup: {calendar_result.get('deleted', 0)} events deleted")
-        
-        # Step 3: Clear database
-        if progress_callback:
-            progress_callback({'step': 'database', 'message': 'Clearing database...'})
-        
-        try:
-            db = CaseDatabase()
-            db_result = db.clear_all_data()
-            cleanup_results['database_cleanup'] = db_result
-            print(f"âœ… Database cleanup: {db_result.get('cases_deleted', 0)} cases deleted")
-        except Exception as db_error:
-            cleanup_results['database_cleanup'] = {'error': str(db_error)}
-            print(f"âŒ Database cleanup failed: {db_error}")
-        
-        # Step 4: Clear local files
-        if progress_callback:
-            progress_callback({'step': 'files', 'message': 'Deleting local files...'})
-        
-        file_result = clear_local_case_files()
         cleanup_results['file_cleanup'] = file_result
         print(f"âœ… File cleanup: {file_result.get('total_deleted', 0)} files deleted")
         
@@ -1084,7 +1354,7 @@ def complete_system_cleanup(
 def delete_events_by_cinos(
     cinos: List[str],
     calendar_id='primary',
-    token_path='data/token_calendar.pickle',
+    token_path='data/token_calendar.json',
     creds_path='data/credentials.json',
     port=56585,
     progress_callback=None
@@ -1118,7 +1388,7 @@ def delete_events_by_cinos(
                 'error': 'Authentication failed'
             }
         
-        service = build('calendar', 'v3', credentials=creds)
+        service = _get_service(creds)
         print("✅ Calendar service initialized")
         
         deleted_count = 0
@@ -1126,11 +1396,27 @@ def delete_events_by_cinos(
         not_found_count = 0
         total_processed = 0
         
-        # Get all existing court events first
-        print("📋 Fetching all court events...")
+        # Map CINOs to events: tagged events come straight from a
+        # server-side filter; only fall back to scanning the whole calendar
+        # for CINOs whose events predate tagging
+        cino_to_event_map = {}
+        print("📋 Fetching court events...")
         try:
-            existing_events = get_existing_court_events_detailed(service, calendar_id)
-            print(f"📊 Found {len(existing_events)} total court events")
+            for event in _iter_tagged_court_events(service, calendar_id):
+                event_cino = _event_cino(event)
+                if event_cino:
+                    cino_to_event_map[event_cino] = {
+                        'event_id': event.get('id'),
+                        'summary': event.get('summary', ''),
+                        'start': event.get('start', {})
+                    }
+            print(f"🏷️ Found {len(cino_to_event_map)} tagged court events")
+
+            if any(cino not in cino_to_event_map for cino in cinos):
+                existing_events = get_existing_court_events_detailed(service, calendar_id)
+                print(f"📊 Found {len(existing_events)} total court events")
+            else:
+                existing_events = []
         except Exception as fetch_error:
             print(f"❌ Failed to fetch existing events: {fetch_error}")
             return {
@@ -1141,72 +1427,66 @@ def delete_events_by_cinos(
                 'error': f'Failed to fetch events: {str(fetch_error)}'
             }
         
-        # Create a mapping of CINO to event ID
-        cino_to_event_map = {}
         for event in existing_events:
             description = event.get('description', '')
             # Extract CINO from description using regex
-            cino_match = re.search(r'CINO:\s*([^\n\r]+)', description, re.IGNORECASE)
+            cino_match = _CINO_RE.search(description)
             if cino_match:
-                cino = cino_match.group(1).strip()
-                cino_to_event_map[cino] = {
+                cino = cino_match.group(1)
+                cino_to_event_map.setdefault(cino, {
                     'event_id': event.get('id'),
                     'summary': event.get('summary', ''),
                     'start': event.get('start', {})
-                }
+                })
         
         print(f"🔗 Mapped {len(cino_to_event_map)} events to CINOs")
         
-        # Delete events for each CINO
-        for i, cino in enumerate(cinos):
-            try:
-                total_processed += 1
-                
-                if cino in cino_to_event_map:
-                    event_info = cino_to_event_map[cino]
-                    event_id = event_info['event_id']
-                    summary = event_info['summary']
-                    
-                    try:
-                        # Delete the event
-                        service.events().delete(
-                            calendarId=calendar_id,
-                            eventId=event_id
-                        ).execute()
-                        
-                        print(f"✅ Deleted event #{deleted_count + 1}: '{summary}' (CINO: {cino})")
-                        deleted_count += 1
-                        
-                    except Exception as delete_error:
-                        print(f"❌ Failed to delete event for CINO {cino}: {delete_error}")
-                        failed_count += 1
-                        
-                else:
-                    print(f"⚠️ No event found for CINO: {cino}")
-                    not_found_count += 1
-                
-                # Progress callback
-                if progress_callback:
-                    try:
-                        progress_callback({
-                            'processed': total_processed,
-                            'total': len(cinos),
-                            'deleted': deleted_count,
-                            'failed': failed_count,
-                            'not_found': not_found_count,
-                            'current_cino': cino,
-                            'current_event': cino_to_event_map.get(cino, {}).get('summary', 'Unknown')
-                        })
-                    except Exception as callback_error:
-                        print(f"⚠️ Progress callback error: {callback_error}")
-                
-                # Rate limiting
-                import time
-                time.sleep(0.2)
-                
-            except Exception as cino_error:
-                print(f"❌ Error processing CINO {cino}: {cino_error}")
+        # Resolve every CINO once, then delete the matched events in batches
+        to_delete = {}
+        for cino in cinos:
+            if cino in cino_to_event_map:
+                event_info = cino_to_event_map[cino]
+                to_delete.setdefault(event_info['event_id'], (cino, event_info['summary']))
+            else:
+                print(f"⚠️ No event found for CINO: {cino}")
+                not_found_count += 1
+        total_processed = len(cinos) - len(to_delete)
+
+        def record_result(event_id, response, error):
+            nonlocal deleted_count, failed_count
+            cino, summary = to_delete[event_id]
+            if error is None:
+                logger.debug("Deleted event #%d: '%s' (CINO: %s)", deleted_count + 1, summary, cino)
+                deleted_count += 1
+            else:
+                print(f"❌ Failed to delete event for CINO {cino}: {error}")
                 failed_count += 1
+
+        def finish_batch(chunk, batch_error):
+            nonlocal failed_count, total_processed
+            if batch_error is not None:
+                print(f"❌ Batch delete failed for {len(chunk)} events: {batch_error}")
+                failed_count += len(chunk)
+            total_processed += len(chunk)
+            print(f"📦 Batch done: {total_processed}/{len(cinos)} processed ({deleted_count} deleted, {failed_count} failed)")
+
+            # Progress callback, once per batch
+            if progress_callback:
+                cino, summary = to_delete[chunk[-1]]
+                try:
+                    progress_callback({
+                        'processed': total_processed,
+                        'total': len(cinos),
+                        'deleted': deleted_count,
+                        'failed': failed_count,
+                        'not_found': not_found_count,
+                        'current_cino': cino,
+                        'current_event': summary
+                    })
+                except Exception as callback_error:
+                    print(f"⚠️ Progress callback error: {callback_error}")
+
+        _run_delete_batches(service, creds, calendar_id, to_delete, record_result, finish_batch)
         
         # Final results
         result = {
@@ -1236,31 +1516,15 @@ def get_existing_court_events_detailed(service, calendar_id='primary'):
     """Get existing court events with detailed information for CINO-based operations"""
     try:
         events = []
-        page_token = None
         
-        while True:
-            events_result = service.events().list(
-                calendarId=calendar_id,
-                pageToken=page_token,
-                maxResults=2500,
-                singleEvents=True,
-                orderBy='startTime'
-            ).execute()
-            
-            batch_events = events_result.get('items', [])
-            
+        for batch_events in _iter_event_pages(
+            service, calendar_id, 'id,summary,description,start,end,reminders'
+        ):
             for event in batch_events:
                 summary = event.get('summary', '') or ''
                 description = event.get('description', '') or ''
                 
-                # Check if it's a court event
-                if (' vs ' in summary.lower() or
-                    ' v. ' in summary.lower() or
-                    ' v ' in summary.lower() or
-                    'cino:' in description.lower() or
-                    'case no:' in description.lower() or
-                    'establishment:' in description.lower()):
-                    
+                if _is_court_event(summary, description):
                     events.append({
                         'id': event.get('id'),
                         'summary': summary,
@@ -1269,10 +1533,6 @@ def get_existing_court_events_detailed(service, calendar_id='primary'):
                         'end': event.get('end', {}),
                         'reminders': event.get('reminders', {})
                     })
-            
-            page_token = events_result.get('nextPageToken')
-            if not page_token:
-                break
         
         return events
         
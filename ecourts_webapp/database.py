@@ -1,19 +1,282 @@
 import sqlite3
+import threading
+import itertools
 import json, os
-import pandas as pd
-from datetime import datetime
+import logging
+import zlib
+from datetime import datetime, timezone
 from typing import List, Dict, Optional
 
+# Per-case detail from the import and hearing-date paths goes through this logger
+# at DEBUG level, so it costs nothing unless it is switched on
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+except ImportError:  # Optional speedup; fall back to the standard library
+    orjson = None
+
+if orjson is not None:
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch either
+    def _json_loads(data):
+        return orjson.loads(data)
+
+    _json_dumps_bytes = orjson.dumps
+else:
+    _json_loads = json.loads
+
+    def _json_dumps_bytes(obj) -> bytes:
+        return json.dumps(obj).encode('utf-8')
+
+# Case fields compared against each daily file row, in UPDATE_CASE_SQL order
+COMPARED_FIELDS = (
+    'case_no', 'petparty_name', 'resparty_name', 'establishment_name',
+    'state_name', 'district_name', 'date_next_list', 'date_last_list',
+    'purpose_name', 'type_name', 'court_no_desg_name', 'disp_name'
+)
+
+# Record fields written by UPDATE_CASE_SQL / INSERT_CASE_SQL, in parameter order
+UPDATE_FIELDS = COMPARED_FIELDS + ('user_notes', 'user_side')
+INSERT_FIELDS = ('cino',) + COMPARED_FIELDS + ('user_notes', 'user_side', 'date_of_decision')
+
+# Columns the case lists and calendar export read; the detail view still selects every column
+LIST_COLUMNS = (
+    'cino', 'case_no', 'petparty_name', 'resparty_name', 'establishment_name',
+    'state_name', 'district_name', 'date_next_list', 'date_last_list',
+    'purpose_name', 'type_name', 'court_no_desg_name', 'disp_name',
+    'user_notes', 'is_changed', 'user_side', 'reg_no', 'reg_year', 'date_of_decision'
+)
+LIST_SELECT = f"SELECT {', '.join(LIST_COLUMNS)} FROM cases"
+
+# Every stored case column plus the original record from cases_raw, for the myCases.txt-style export
+EXPORT_COLUMNS = ('id',) + LIST_COLUMNS + ('updated_at', 'change_summary')
+EXPORT_SELECT = f"""
+    SELECT {', '.join(f'cases.{column}' for column in EXPORT_COLUMNS)}, cases_raw.raw_data
+    FROM cases LEFT JOIN cases_raw ON cases_raw.cino = cases.cino
+"""
+
+# date.toordinal() + JULIAN_DAY_OFFSET == CAST(julianday(date) AS INTEGER) in SQLite
+JULIAN_DAY_OFFSET = 1721424
+
+# Stored in PRAGMA user_version once init_database has brought a file up to date;
+# bump it whenever the schema setup below changes
+SCHEMA_VERSION = 4
+
+# Bound parameters per "cino IN (...)" lookup, well under SQLITE_MAX_VARIABLE_NUMBER
+LOOKUP_CHUNK_SIZE = 500
+
+INSERT_CASE_SQL = """
+    INSERT INTO cases (
+        cino, case_no, petparty_name, resparty_name, establishment_name,
+        state_name, district_name, date_next_list, date_last_list,
+        purpose_name, type_name, court_no_desg_name, disp_name,
+        reg_no, reg_year, is_changed, date_of_decision, user_notes, user_side
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+UPDATE_CASE_SQL = """
+    UPDATE cases SET
+    case_no=?, petparty_name=?, resparty_name=?, establishment_name=?,
+    state_name=?, district_name=?, date_next_list=?, date_last_list=?,
+    purpose_name=?, type_name=?, court_no_desg_name=?, disp_name=?,
+    is_changed=TRUE, updated_at=CURRENT_TIMESTAMP,
+    reg_no=?, reg_year=?, user_notes=?, user_side=?
+    WHERE cino=?
+"""
+
+# The original JSON of each case is kept out of the cases rows scanned by every list view,
+# zlib-compressed (see _pack_raw_data / _unpack_raw_data)
+RAW_DATA_COMPRESSION_LEVEL = 3
+
+UPSERT_RAW_SQL = """
+    INSERT INTO cases_raw (cino, raw_data) VALUES (?, ?)
+    ON CONFLICT(cino) DO UPDATE SET raw_data = excluded.raw_data
+"""
+
+INSERT_HISTORY_SQL = """
+    INSERT INTO case_history (cino, field_name, old_value, new_value)
+    VALUES (?, ?, ?, ?)
+"""
+
+# Placeholder values that mean a case has no hearing date
+NO_HEARING_DATES = frozenset(['', 'Not set', 'Not scheduled'])
+
+UPDATE_HEARING_DATE_SQL = """
+    UPDATE cases SET
+        date_next_list = ?,
+        date_last_list = ?,
+        user_notes = ?,
+        updated_at = CURRENT_TIMESTAMP
+    WHERE cino = ?
+"""
+
+# One UPDATE per column update_case_field may change; fields not listed here are rejected
+UPDATE_FIELD_SQL = {
+    field_name: f"""
+    UPDATE cases
+    SET {field_name} = ?, updated_at = CURRENT_TIMESTAMP
+    WHERE cino = ?
+"""
+    for field_name in (
+        'petparty_name', 'resparty_name', 'purpose_name',
+        'type_name', 'court_no_desg_name', 'user_side', 'date_of_decision'
+    )
+}
+
+# Prepared statements kept per connection; the default of 128 is shared by every method
+STATEMENT_CACHE_SIZE = 256
+
+# Per-connection settings; journal_mode=WAL is persistent and set once in init_database
+CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-20000",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA analysis_limit=1000",
+)
+
+def _iter_daily_records(f):
+    """Return an iterator over the case records in a daily file opened in binary mode.
+
+    Newline-delimited JSON (the usual myCases.txt layout) is parsed line by
+    line as it is read; a JSON array, of objects or of JSON strings, or a
+    single pretty-printed object is parsed whole. Returns None for an empty file.
+    """
+    first_line = b''
+    for line in f:
+        first_line = line.strip()
+        if first_line:
+            break
+    if not first_line:
+        return None
+
+    if first_line.startswith(b'{'):
+        try:
+            first_record = _json_loads(first_line)
+        except json.JSONDecodeError:
+            # Format 3: Single JSON object spread over several lines
+            f.seek(0)
+            first_record = None
+        if first_record is not None:
+            # Format 2: One JSON object per line
+            return itertools.chain(
+                [first_record],
+                (_json_loads(line) for line in f if line.strip())
+            )
+    else:
+        f.seek(0)
+
+    parsed = _json_loads(f.read())
+    if isinstance(parsed, dict):
+        return iter([parsed])
+    if not isinstance(parsed, list):
+        raise ValueError("expected a JSON object or array")
+    # Format 1: List of JSON strings ["{ ... }", "{ ... }"]
+    if all(isinstance(item, str) for item in parsed):
+        return (_json_loads(item) for item in parsed)
+    # Or a list of objects directly
+    if all(isinstance(item, dict) for item in parsed):
+        return iter(parsed)
+    raise ValueError("list items must all be objects or all be JSON strings")
+
+
+def _pack_raw_data(case_data: dict) -> bytes:
+    """Serialize a case's original JSON for cases_raw"""
+    return zlib.compress(_json_dumps_bytes(case_data), RAW_DATA_COMPRESSION_LEVEL)
+
+
+def _unpack_raw_data(blob: bytes) -> dict:
+    """Inverse of _pack_raw_data"""
+    return _json_loads(zlib.decompress(blob))
+
+
+def _extract_fields(case_data: dict, field_names) -> tuple:
+    """Read field_names from a daily-file record, falling back to its nested raw_data JSON.
+
+    Empty top-level values are looked up in raw_data, which is parsed at most
+    once per record; values missing from both come back as ''.
+    """
+    nested = None
+    values = []
+    for field_name in field_names:
+        # Priority 1: Direct field from outer JSON
+        value = case_data.get(field_name, '')
+        # Priority 2: If empty, try from raw_data (parsed)
+        if not value and 'raw_data' in case_data:
+            if nested is None:
+                nested = {}
+                raw_data_str = case_data.get('raw_data', '{}')
+                if isinstance(raw_data_str, str):
+                    try:
+                        parsed = _json_loads(raw_data_str)
+                        if isinstance(parsed, dict):
+                            nested = parsed
+                    except (json.JSONDecodeError, TypeError):
+                        pass
+            value = nested.get(field_name, '')
+        values.append(value if value else '')
+    return tuple(values)
+
+
+def _stored_values(values) -> tuple:
+    """Normalize compared field values the way the TEXT columns hold them (NULL as '')"""
+    return tuple('' if value is None else str(value) for value in values)
+
+
+def _batched(iterable, size: int):
+    """Yield lists of up to size items from iterable"""
+    iterator = iter(iterable)
+    while True:
+        batch = list(itertools.islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
 class CaseDatabase:
     def __init__(self, db_path="data/cases.db"):
         self.db_path = db_path
+        # One long-lived connection per thread (Flask serves requests on several);
+        # each thread also keeps its last get_case_counts result there
+        self._local = threading.local()
         self.init_database()
 
+    def _connect(self) -> sqlite3.Connection:
+        """Return this thread's connection to the case database, opening it on first use"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, cached_statements=STATEMENT_CACHE_SIZE)
+            conn.row_factory = sqlite3.Row
+            for pragma in CONNECTION_PRAGMAS:
+                conn.execute(pragma)
+            self._local.conn = conn
+        return conn
+
+    def _commit(self, conn: sqlite3.Connection):
+        """Commit and invalidate this thread's cached dashboard counts"""
+        conn.commit()
+        # PRAGMA data_version only moves for other connections' commits
+        self._local.counts_cache = None
+
+    def _rollback(self):
+        """Discard this thread's uncommitted writes, so a failed method leaves nothing for the next commit"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.rollback()
+
     def init_database(self):
         """Initialize database with required tables"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
 
+        # Schema already current: skip the DDL, migrations and catalog probes
+        cursor.execute("PRAGMA user_version")
+        if cursor.fetchone()[0] >= SCHEMA_VERSION:
+            return
+
+        # WAL lets readers run during ingestion and needs one fsync per commit
+        conn.execute("PRAGMA journal_mode=WAL")
+
         # Cases table with new columns - FIXED: DEFAULT FALSE for is_changed
         cursor.execute("""
         CREATE TABLE IF NOT EXISTS cases (
@@ -34,7 +297,7 @@ class CaseDatabase:
             updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             user_notes TEXT DEFAULT '',
             is_changed BOOLEAN DEFAULT FALSE,
-            change_summary TEXT DEFAULT '',
+            change_summary TEXT DEFAULT '',  -- no longer written, see get_change_summary()
             raw_data TEXT,
             user_side TEXT DEFAULT '',
             reg_no INTEGER,
@@ -43,26 +306,29 @@ class CaseDatabase:
         )
         """)
 
-        # Add new columns if they don't exist (for existing databases)
-        try:
+        # Add new columns if they don't exist (for existing databases);
+        # table_xinfo also lists generated columns
+        cursor.execute("PRAGMA table_xinfo(cases)")
+        columns = {row['name'] for row in cursor.fetchall()}
+
+        if 'user_side' not in columns:
             cursor.execute("ALTER TABLE cases ADD COLUMN user_side TEXT DEFAULT ''")
-        except sqlite3.OperationalError:
-            pass # Column already exists
 
-        try:
+        if 'reg_no' not in columns:
             cursor.execute("ALTER TABLE cases ADD COLUMN reg_no INTEGER")
-        except sqlite3.OperationalError:
-            pass
 
-        try:
+        if 'reg_year' not in columns:
             cursor.execute("ALTER TABLE cases ADD COLUMN reg_year INTEGER")
-        except sqlite3.OperationalError:
-            pass
 
-        try:
+        if 'date_of_decision' not in columns:
             cursor.execute("ALTER TABLE cases ADD COLUMN date_of_decision TEXT DEFAULT NULL")
-        except sqlite3.OperationalError:
-            pass
+
+        # Next hearing as an integer Julian day (-1 when unscheduled), derived by SQLite on write
+        if 'date_next_list_day' not in columns:
+            cursor.execute("""
+            ALTER TABLE cases ADD COLUMN date_next_list_day INTEGER
+            GENERATED ALWAYS AS (COALESCE(CAST(julianday(date(date_next_list)) AS INTEGER), -1)) VIRTUAL
+            """)
 
         # Change history table
         cursor.execute("""
@@ -77,111 +343,168 @@ class CaseDatabase:
         )
         """)
 
-        conn.commit()
-        conn.close()
+        # Original JSON of each case, one row per CINO
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS cases_raw (
+            cino TEXT PRIMARY KEY,
+            raw_data BLOB
+        )
+        """)
+
+        # Move raw_data left in cases by older versions into cases_raw
+        cursor.execute("""
+        INSERT OR IGNORE INTO cases_raw (cino, raw_data)
+        SELECT cino, raw_data FROM cases WHERE raw_data IS NOT NULL
+        """)
+        cursor.execute("UPDATE cases SET raw_data = NULL WHERE raw_data IS NOT NULL")
+
+        # Compress raw_data still stored as JSON text
+        cursor.execute("SELECT cino, raw_data FROM cases_raw WHERE typeof(raw_data) = 'text'")
+        cursor.executemany(
+            "UPDATE cases_raw SET raw_data = ? WHERE cino = ?",
+            [(zlib.compress(row['raw_data'].encode('utf-8'), RAW_DATA_COMPRESSION_LEVEL), row['cino'])
+             for row in cursor.fetchall()]
+        )
+
+        # Indexes for the list/count filters and the per-case history lookups
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_user_side ON cases(user_side)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_is_changed_updated ON cases(is_changed, updated_at DESC)")
+        cursor.execute("DROP INDEX IF EXISTS idx_next_list")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_next_day ON cases(date_next_list_day)")
+        # History is always read for one case and one field_name at a time
+        cursor.execute("DROP INDEX IF EXISTS idx_history_cino")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_history_cino_field ON case_history(cino, field_name, changed_at)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_history_cino_field_old ON case_history(cino, field_name, old_value)")
+
+        # Give the planner statistics for the indexes above
+        cursor.execute("ANALYZE")
+
+        cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self._commit(conn)
 
     def process_daily_file(self, file_path: str) -> Dict[str, int]:
         """Process daily myCases.txt file and detect changes - FIXED"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                raw_content = f.read().strip()
+            with open(file_path, 'rb') as f:
+                records = _iter_daily_records(f)
+                if records is None:
+                    return {"error": "File is empty"}
+
+                # Process the data
+                conn = self._connect()
+                cursor = conn.cursor()
                 
-            if not raw_content:
-                return {"error": "File is empty"}
+                stats = {"new": 0, "updated": 0, "unchanged": 0}
+                existing_cases = {}
+                seen_records = 0
 
-            # Try to parse the file in different formats
-            data_list = []
-            try:
-                # Format 1: List of JSON strings ["{ ... }", "{ ... }"]
-                parsed = json.loads(raw_content)
-                if isinstance(parsed, list):
-                    # Check if it's a list of strings (JSON format)
-                    if all(isinstance(item, str) for item in parsed):
-                        data_list = [json.loads(item) for item in parsed]
-                    # Or a list of objects directly
-                    elif all(isinstance(item, dict) for item in parsed):
-                        data_list = parsed
-                    else:
-                        raise ValueError("Invalid list format")
-                elif isinstance(parsed, dict):
-                    # Format 3: Single JSON object
-                    data_list = [parsed]
-                else:
-                    raise ValueError("Invalid JSON format")
-            except (json.JSONDecodeError, ValueError):
-                try:
-                    # Format 2: One JSON object per line
-                    lines = raw_content.splitlines()
-                    data_list = []
-                    for line in lines:
-                        line = line.strip()
-                        if line: # Skip empty lines
-                            data_list.append(json.loads(line))
-                except json.JSONDecodeError as e:
-                    return {"error": f"Invalid JSON format: {str(e)}"}
+                # One transaction for the whole file: a single journal sync on commit.
+                # IMMEDIATE takes the write lock up front, so the prefetched rows
+                # cannot go stale under another writer before our writes land.
+                cursor.execute("BEGIN IMMEDIATE")
 
-            if not data_list:
-                return {"error": "No valid case data found in file"}
+                # Records are handled in bounded batches as they are parsed
+                for batch in _batched(records, LOOKUP_CHUNK_SIZE):
+                    seen_records += len(batch)
+                    self._process_record_batch(cursor, batch, existing_cases, stats)
 
-            # Process the data
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            stats = {"new": 0, "updated": 0, "unchanged": 0}
-            
-            for case_data in data_list:
-                if not isinstance(case_data, dict):
-                    continue
-                    
-                cino = case_data.get('cino')
-                if not cino:
-                    continue
+                if not seen_records:
+                    conn.rollback()
+                    return {"error": "No valid case data found in file"}
 
-                # Check if case exists
-                cursor.execute("SELECT * FROM cases WHERE cino = ?", (cino,))
-                existing_case = cursor.fetchone()
-                
-                if existing_case:
-                    # Check for changes
-                    changes = self._detect_changes(existing_case, case_data)
-                    if changes:
-                        # ONLY cases with actual changes are marked for review
-                        self._update_case_with_changes(cursor, cino, case_data, changes)
-                        stats["updated"] += 1
-                    else:
-                        stats["unchanged"] += 1
-                else:
-                    # FIXED: New case - insert as NOT CHANGED (is_changed=FALSE)
-                    self._insert_new_case(cursor, case_data)
-                    stats["new"] += 1
+                self._commit(conn)
+
+            # The import is committed; refreshing planner statistics is best-effort.
+            # PRAGMA optimize only re-analyzes tables whose row counts have moved
+            # a lot since their last ANALYZE (sampled, see analysis_limit).
+            try:
+                conn.execute("PRAGMA optimize")
+            except sqlite3.Error as optimize_error:
+                logger.debug("Skipped PRAGMA optimize after import: %s", optimize_error)
 
-            conn.commit()
-            conn.close()
-            
             print("📊 Daily file processed:", stats)
             return stats
 
+        except (json.JSONDecodeError, ValueError) as e:
+            self._rollback()
+            return {"error": f"Invalid JSON format: {str(e)}"}
         except Exception as e:
+            self._rollback()
             print(f"Error processing file: {e}")
             import traceback
             traceback.print_exc()
             return {"error": f"Processing failed: {str(e)}"}
 
-    def _detect_changes(self, existing_case: tuple, new_data: dict) -> List[Dict]:
-        """Detect changes between existing case and new data"""
+    def _process_record_batch(self, cursor, batch: list, existing_cases: dict, stats: Dict[str, int]):
+        """Diff one batch of daily-file records against the database and write the results"""
+        inserts, updates, history_rows, raw_rows = [], [], [], []
+
+        # Fetch the existing cases named in this batch that we have not seen yet
+        cinos = list({
+            case_data.get('cino') for case_data in batch
+            if isinstance(case_data, dict) and case_data.get('cino')
+            and case_data.get('cino') not in existing_cases
+        })
+        if cinos:
+            placeholders = ','.join('?' * len(cinos))
+            cursor.execute(
+                f"SELECT cino, {', '.join(COMPARED_FIELDS)} FROM cases WHERE cino IN ({placeholders})",
+                cinos
+            )
+            for row in cursor.fetchall():
+                existing_cases[row['cino']] = _stored_values(tuple(row)[1:])
+        
+        for case_data in batch:
+            if not isinstance(case_data, dict):
+                continue
+                
+            cino = case_data.get('cino')
+            if not cino:
+                continue
+
+            # Check if case exists
+            existing_case = existing_cases.get(cino)
+            
+            if existing_case is not None:
+                incoming = tuple(str(case_data.get(field, "") or "") for field in COMPARED_FIELDS)
+                # Most records are unchanged: one tuple comparison settles those
+                if incoming == existing_case:
+                    stats["unchanged"] += 1
+                    continue
+
+                # Check for changes
+                changes = self._detect_changes(existing_case, incoming)
+                if changes:
+                    # ONLY cases with actual changes are marked for review
+                    params, case_history = self._update_case_params(cino, case_data, changes)
+                    updates.append(params)
+                    history_rows.extend(case_history)
+                    raw_rows.append((cino, _pack_raw_data(case_data)))
+                    # A later row for the same CINO compares against this one
+                    existing_cases[cino] = _stored_values(params[:len(COMPARED_FIELDS)])
+                    stats["updated"] += 1
+                else:
+                    stats["unchanged"] += 1
+            else:
+                # FIXED: New case - insert as NOT CHANGED (is_changed=FALSE)
+                params = self._insert_case_params(case_data)
+                inserts.append(params)
+                # Store original for reference
+                raw_rows.append((params[0], _pack_raw_data(case_data)))
+                existing_cases[cino] = _stored_values(params[1:len(COMPARED_FIELDS) + 1])
+                stats["new"] += 1
+
+        # Inserts first, so an update of a CINO inserted above finds its row
+        cursor.executemany(INSERT_CASE_SQL, inserts)
+        cursor.executemany(UPDATE_CASE_SQL, updates)
+        cursor.executemany(INSERT_HISTORY_SQL, history_rows)
+        cursor.executemany(UPSERT_RAW_SQL, raw_rows)
+
+    def _detect_changes(self, existing_values: tuple, new_values: tuple) -> List[Dict]:
+        """Detect changes between existing and new COMPARED_FIELDS values (NULL/None as '')"""
         changes = []
-        field_mapping = {
-            2: 'case_no', 3: 'petparty_name', 4: 'resparty_name',
-            5: 'establishment_name', 6: 'state_name', 7: 'district_name',
-            8: 'date_next_list', 9: 'date_last_list', 10: 'purpose_name',
-            11: 'type_name', 12: 'court_no_desg_name', 13: 'disp_name'
-        }
 
-        for idx, field_name in field_mapping.items():
-            # Handle None values properly
-            old_value = existing_case[idx] if existing_case[idx] is not None else ""
-            new_value = str(new_data.get(field_name, "") or "") # Handle None from new_data too
-            
+        for field_name, old_value, new_value in zip(COMPARED_FIELDS, existing_values, new_values):
             if old_value != new_value:
                 changes.append({
                     'field': field_name,
@@ -193,120 +516,55 @@ class CaseDatabase:
 
     def _update_case_with_changes(self, cursor, cino: str, case_data: dict, changes: List[Dict]):
         """Update case and record changes - FIXED: Use consistent data extraction"""
+        params, history_rows = self._update_case_params(cino, case_data, changes)
+        cursor.execute(UPDATE_CASE_SQL, params)
+        cursor.execute(UPSERT_RAW_SQL, (cino, _pack_raw_data(case_data)))
+
+        # Record individual changes
+        cursor.executemany(INSERT_HISTORY_SQL, history_rows)
+
+    def _update_case_params(self, cino: str, case_data: dict, changes: List[Dict]) -> tuple:
+        """Build the UPDATE_CASE_SQL parameters and case_history rows for a changed case"""
         
-        # Use the same field extraction logic
-        def get_field_value(field_name, case_data):
-            outer_value = case_data.get(field_name, '')
-            if not outer_value and 'raw_data' in case_data:
-                try:
-                    raw_data_str = case_data.get('raw_data', '{}')
-                    if isinstance(raw_data_str, str):
-                        raw_data = json.loads(raw_data_str)
-                        inner_value = raw_data.get(field_name, '')
-                        return inner_value if inner_value else outer_value
-                except (json.JSONDecodeError, TypeError):
-                    pass
-            return outer_value if outer_value else ''
-        
-        cursor.execute("""
-            UPDATE cases SET
-            case_no=?, petparty_name=?, resparty_name=?, establishment_name=?,
-            state_name=?, district_name=?, date_next_list=?, date_last_list=?,
-            purpose_name=?, type_name=?, court_no_desg_name=?, disp_name=?,
-            is_changed=TRUE, change_summary=?, raw_data=?, updated_at=CURRENT_TIMESTAMP,
-            reg_no=?, reg_year=?, user_notes=?, user_side=?
-            WHERE cino=?
-        """, (
-            get_field_value('case_no', case_data),
-            get_field_value('petparty_name', case_data),
-            get_field_value('resparty_name', case_data),
-            get_field_value('establishment_name', case_data),
-            get_field_value('state_name', case_data),
-            get_field_value('district_name', case_data),
-            get_field_value('date_next_list', case_data),
-            get_field_value('date_last_list', case_data),
-            get_field_value('purpose_name', case_data),
-            get_field_value('type_name', case_data),
-            get_field_value('court_no_desg_name', case_data),
-            get_field_value('disp_name', case_data),
-            json.dumps([f"{c['field']}: {c['old_value']} → {c['new_value']}" for c in changes]),
-            json.dumps(case_data),
+        (*compared_values, user_notes, user_side) = _extract_fields(case_data, UPDATE_FIELDS)
+        params = (
+            *compared_values,
             case_data.get('reg_no'),
             case_data.get('reg_year'),
-            get_field_value('user_notes', case_data),  # FIXED
-            get_field_value('user_side', case_data),   # FIXED
+            user_notes,  # FIXED
+            user_side,   # FIXED
             cino
-        ))
-
-        # Record individual changes
-        for change in changes:
-            cursor.execute("""
-            INSERT INTO case_history (cino, field_name, old_value, new_value)
-            VALUES (?, ?, ?, ?)
-            """, (cino, change['field'], change['old_value'], change['new_value']))
+        )
+        history_rows = [
+            (cino, change['field'], change['old_value'], change['new_value'])
+            for change in changes
+        ]
+        return params, history_rows
 
     
     def _insert_new_case(self, cursor, case_data: dict):
         """Insert new case record - FIXED: Handle nested JSON properly for ALL fields"""
-        
-        cino = case_data.get('cino', '').strip()
-        print(f"🔍 Processing case: {cino}")
-        
-        # FIXED: Extract data with proper priority handling
-        def get_field_value(field_name, case_data):
-            """Get field value with fallback logic"""
-            # Priority 1: Direct field from outer JSON
-            outer_value = case_data.get(field_name, '')
-            
-            # Priority 2: If empty, try from raw_data (parsed)
-            if not outer_value and 'raw_data' in case_data:
-                try:
-                    raw_data_str = case_data.get('raw_data', '{}')
-                    if isinstance(raw_data_str, str):
-                        raw_data = json.loads(raw_data_str)
-                        inner_value = raw_data.get(field_name, '')
-                        return inner_value if inner_value else outer_value
-                except (json.JSONDecodeError, TypeError):
-                    pass
-            
-            return outer_value if outer_value else ''
+        params = self._insert_case_params(case_data)
+        cursor.execute(INSERT_CASE_SQL, params)
+        # Store original for reference
+        cursor.execute(UPSERT_RAW_SQL, (params[0], _pack_raw_data(case_data)))
+        logger.debug("Case %s inserted", params[0])
+
+    def _insert_case_params(self, case_data: dict) -> tuple:
+        """Build the INSERT_CASE_SQL parameters for a new case"""
         
         # FIXED: Extract all fields using consistent logic
-        extracted_data = {
-            'cino': get_field_value('cino', case_data),
-            'case_no': get_field_value('case_no', case_data),
-            'petparty_name': get_field_value('petparty_name', case_data),
-            'resparty_name': get_field_value('resparty_name', case_data),
-            'establishment_name': get_field_value('establishment_name', case_data),
-            'state_name': get_field_value('state_name', case_data),
-            'district_name': get_field_value('district_name', case_data),
-            'date_next_list': get_field_value('date_next_list', case_data),
-            'date_last_list': get_field_value('date_last_list', case_data),
-            'purpose_name': get_field_value('purpose_name', case_data),
-            'type_name': get_field_value('type_name', case_data),
-            'court_no_desg_name': get_field_value('court_no_desg_name', case_data),
-            'disp_name': get_field_value('disp_name', case_data),
-            'user_notes': get_field_value('user_notes', case_data),
-            'user_side': get_field_value('user_side', case_data),
-            'reg_no': case_data.get('reg_no') or None,
-            'reg_year': case_data.get('reg_year') or None,
-            'date_of_decision': get_field_value('date_of_decision', case_data)
-        }
+        extracted_data = dict(zip(INSERT_FIELDS, _extract_fields(case_data, INSERT_FIELDS)))
+        extracted_data['reg_no'] = case_data.get('reg_no') or None
+        extracted_data['reg_year'] = case_data.get('reg_year') or None
         
-        # Debug logging
-        print(f"📝 Extracted data for {cino}:")
-        print(f"   user_notes: '{extracted_data['user_notes']}'")
-        print(f"   petparty_name: '{extracted_data['petparty_name'][:50]}...'")
-        print(f"   case_no: '{extracted_data['case_no']}'")
+        logger.debug(
+            "Extracted data for %s: user_notes=%r petparty_name=%.50r case_no=%r",
+            extracted_data['cino'], extracted_data['user_notes'],
+            extracted_data['petparty_name'], extracted_data['case_no']
+        )
         
-        cursor.execute("""
-            INSERT INTO cases (
-                cino, case_no, petparty_name, resparty_name, establishment_name,
-                state_name, district_name, date_next_list, date_last_list,
-                purpose_name, type_name, court_no_desg_name, disp_name, raw_data,
-                reg_no, reg_year, is_changed, date_of_decision, user_notes, user_side
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
+        return (
             extracted_data['cino'],
             extracted_data['case_no'],
             extracted_data['petparty_name'],
@@ -320,90 +578,103 @@ class CaseDatabase:
             extracted_data['type_name'],
             extracted_data['court_no_desg_name'],
             extracted_data['disp_name'],
-            json.dumps(case_data),  # Store original for reference
             extracted_data['reg_no'],
             extracted_data['reg_year'],
             False,  # is_changed
             extracted_data['date_of_decision'],
             extracted_data['user_notes'],  # FIXED: Use extracted notes
             extracted_data['user_side']    # FIXED: Use extracted user_side
-        ))
-        
-        print(f"✅ Case {cino} inserted with correct data")
+        )
 
     def create_new_case(self, case_data: dict) -> tuple[bool, str]:
         """Create a new case manually"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             cursor = conn.cursor()
             
             # Check if CINO already exists
             cursor.execute("SELECT cino FROM cases WHERE cino = ?", (case_data.get('cino'),))
             if cursor.fetchone():
-                conn.close()
                 return False, "Case with this CINO already exists"
                 
             self._insert_new_case(cursor, case_data)
-            conn.commit()
-            conn.close()
+            self._commit(conn)
             return True, "Case created successfully"
             
         except Exception as e:
+            self._rollback()
             print(f"Error creating case: {e}")
             return False, str(e)
 
     def get_all_cases(self) -> List[Dict]:
         """Get all cases with change status"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
-        cursor.execute("""
-        SELECT * FROM cases ORDER BY
+        cursor.execute(f"""
+        {LIST_SELECT} ORDER BY
             CASE WHEN is_changed = 1 THEN 0 ELSE 1 END,
             updated_at DESC
         """)
-        cases = cursor.fetchall()
-        conn.close()
-        return [self._row_to_dict(case) for case in cases]
+        return [self._row_to_dict(case) for case in cursor]
+
+    def get_all_cases_for_export(self) -> List[Dict]:
+        """Get all cases in get_all_cases order with every column, raw_data as the original JSON text"""
+        conn = self._connect()
+        cursor = conn.cursor()
+        cursor.execute(f"""
+        {EXPORT_SELECT} ORDER BY
+            CASE WHEN cases.is_changed = 1 THEN 0 ELSE 1 END,
+            cases.updated_at DESC
+        """)
+        cases = []
+        for row in cursor:
+            case = self._row_to_dict(row)
+            if case['raw_data'] is not None:
+                case['raw_data'] = zlib.decompress(case['raw_data']).decode('utf-8')
+            cases.append(case)
+        return cases
 
     def get_case_by_cino(self, cino: str) -> Optional[Dict]:
         """Get specific case by CINO"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
-        cursor.execute("SELECT * FROM cases WHERE cino = ?", (cino,))
+        cursor.execute("SELECT * FROM cases WHERE cino = ?", (cino,))  # Detail view: every column
         case = cursor.fetchone()
-        conn.close()
         return self._row_to_dict(case) if case else None
 
     def update_case_notes(self, cino: str, notes: str, other_updates: dict = None) -> bool:
         """Update case notes and other fields"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
-        if other_updates:
-            # Build dynamic update query
-            update_fields = ["user_notes = ?"]
-            values = [notes]
-            
-            for field, value in other_updates.items():
-                update_fields.append(f"{field} = ?")
-                values.append(value)
+        try:
+            if other_updates:
+                # Build dynamic update query
+                update_fields = ["user_notes = ?"]
+                values = [notes]
                 
-            values.append(cino)
-            cursor.execute(f"""
-            UPDATE cases SET {', '.join(update_fields)}
-            WHERE cino = ?
-            """, values)
-        else:
-            cursor.execute("UPDATE cases SET user_notes = ? WHERE cino = ?", (notes, cino))
-            
-        conn.commit()
-        conn.close()
+                for field, value in other_updates.items():
+                    update_fields.append(f"{field} = ?")
+                    values.append(value)
+                    
+                values.append(cino)
+                cursor.execute(f"""
+                UPDATE cases SET {', '.join(update_fields)}
+                WHERE cino = ?
+                """, values)
+            else:
+                cursor.execute("UPDATE cases SET user_notes = ? WHERE cino = ?", (notes, cino))
+                
+            self._commit(conn)
+        except Exception:
+            self._rollback()
+            raise
         return True
 
     def mark_case_as_reviewed(self, cino: str) -> bool:
         """Mark single case as reviewed without requiring notes"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             cursor = conn.cursor()
             
             cursor.execute("""
@@ -419,100 +690,83 @@ class CaseDatabase:
             VALUES (?, 'marked_reviewed', 'pending', 'reviewed')
             """, (cino,))
             
-            conn.commit()
+            self._commit(conn)
             success = cursor.rowcount > 0
-            conn.close()
             
             if success:
                 print(f"✅ Marked case {cino} as reviewed")
             return success
             
         except Exception as e:
+            self._rollback()
             print(f"Error marking case as reviewed: {e}")
             return False
 
     def get_reviewed_cases_with_notes(self) -> List[Dict]:
         """Get cases that have been reviewed (is_changed = FALSE)"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
-        cursor.execute("""
-        SELECT * FROM cases
+        cursor.execute(f"""
+        {LIST_SELECT}
         WHERE is_changed = FALSE
         ORDER BY updated_at DESC
         """)
-        cases = cursor.fetchall()
-        conn.close()
-        return [self._row_to_dict(case) for case in cases]
+        return [self._row_to_dict(case) for case in cursor]
 
     def get_petitioner_cases(self) -> List[Dict]:
         """Get cases where user is petitioner"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
-        cursor.execute("SELECT * FROM cases WHERE user_side = 'petitioner' ORDER BY updated_at DESC")
-        cases = cursor.fetchall()
-        conn.close()
-        return [self._row_to_dict(case) for case in cases]
+        cursor.execute(f"{LIST_SELECT} WHERE user_side = 'petitioner' ORDER BY updated_at DESC")
+        return [self._row_to_dict(case) for case in cursor]
 
     def get_respondent_cases(self) -> List[Dict]:
         """Get cases where user is respondent"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
-        cursor.execute("SELECT * FROM cases WHERE user_side = 'respondent' ORDER BY updated_at DESC")
-        cases = cursor.fetchall()
-        conn.close()
-        return [self._row_to_dict(case) for case in cases]
+        cursor.execute(f"{LIST_SELECT} WHERE user_side = 'respondent' ORDER BY updated_at DESC")
+        return [self._row_to_dict(case) for case in cursor]
 
     def get_unassigned_cases(self) -> List[Dict]:
         """Get cases where user_side is not set"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
-        cursor.execute("SELECT * FROM cases WHERE user_side IS NULL OR user_side = '' ORDER BY updated_at DESC")
-        cases = cursor.fetchall()
-        conn.close()
-        return [self._row_to_dict(case) for case in cases]
+        cursor.execute(f"{LIST_SELECT} WHERE user_side IS NULL OR user_side = '' ORDER BY updated_at DESC")
+        return [self._row_to_dict(case) for case in cursor]
 
     def get_case_counts(self) -> Dict[str, int]:
         """Get counts for law firm dashboard"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
+
+        # data_version changes whenever any other connection, in this process or
+        # another, commits to the file, so a matching value means nothing changed
+        cursor.execute("PRAGMA data_version")
+        data_version = cursor.fetchone()[0]
+        cached = getattr(self._local, 'counts_cache', None)
+        if cached is not None and cached[0] == data_version:
+            return dict(cached[1])
         
-        # Total cases
-        cursor.execute("SELECT COUNT(*) FROM cases")
-        total_cases = cursor.fetchone()[0]
-        
-        # Changed cases (pending review) 
-        cursor.execute("SELECT COUNT(*) FROM cases WHERE is_changed = TRUE")
-        changed_cases = cursor.fetchone()[0]
-        
-        # Reviewed cases (is_changed = FALSE only)
-        cursor.execute("SELECT COUNT(*) FROM cases WHERE is_changed = FALSE")
-        reviewed_cases = cursor.fetchone()[0]
-        
-        # Petitioner cases
-        cursor.execute("SELECT COUNT(*) FROM cases WHERE user_side = 'petitioner'")
-        petitioner_cases = cursor.fetchone()[0]
-        
-        # Respondent cases
-        cursor.execute("SELECT COUNT(*) FROM cases WHERE user_side = 'respondent'")
-        respondent_cases = cursor.fetchone()[0]
-        
-        # Cases without user side set
-        cursor.execute("SELECT COUNT(*) FROM cases WHERE user_side IS NULL OR user_side = ''")
-        cases_without_user_side = cursor.fetchone()[0]
-        
-        # Upcoming hearings
+        # All dashboard counts in a single pass over the table
         cursor.execute("""
-        SELECT COUNT(*) FROM cases
-        WHERE date_next_list IS NOT NULL
-        AND date_next_list != ''
-        AND date_next_list != 'Not scheduled'
-        AND date(date_next_list) >= date('now')
+        SELECT
+            COUNT(*),
+            COALESCE(SUM(CASE WHEN is_changed = TRUE THEN 1 ELSE 0 END), 0),
+            COALESCE(SUM(CASE WHEN is_changed = FALSE THEN 1 ELSE 0 END), 0),
+            COALESCE(SUM(CASE WHEN user_side = 'petitioner' THEN 1 ELSE 0 END), 0),
+            COALESCE(SUM(CASE WHEN user_side = 'respondent' THEN 1 ELSE 0 END), 0),
+            COALESCE(SUM(CASE WHEN user_side IS NULL OR user_side = '' THEN 1 ELSE 0 END), 0)
+        FROM cases
         """)
+        (total_cases, changed_cases, reviewed_cases, petitioner_cases,
+         respondent_cases, cases_without_user_side) = cursor.fetchone()
+
+        # Upcoming hearings: integer range seek on idx_next_day (today is UTC, like date('now'))
+        today_day = datetime.now(timezone.utc).date().toordinal() + JULIAN_DAY_OFFSET
+        cursor.execute("SELECT COUNT(*) FROM cases WHERE date_next_list_day >= ?", (today_day,))
         upcoming_hearings = cursor.fetchone()[0]
         
-        conn.close()
-        
-        return {
+        counts = {
             'total_cases': total_cases,
             'changed_cases': changed_cases,
             'reviewed_cases': reviewed_cases,
@@ -521,80 +775,80 @@ class CaseDatabase:
             'cases_without_user_side': cases_without_user_side,
             'upcoming_hearings': upcoming_hearings
         }
+        # A commit landing while these were counted changes data_version, so the next call recounts
+        self._local.counts_cache = (data_version, counts)
+        # Callers add their own keys to the result, so never hand out the cached dict
+        return dict(counts)
 
     def mark_multiple_cases_as_reviewed(self, cinos: List[str]) -> int:
         """Mark multiple cases as reviewed for bulk operations"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             cursor = conn.cursor()
-            marked_count = 0
+            params = [(cino,) for cino in cinos]
             
-            for cino in cinos:
-                cursor.execute("""
-                UPDATE cases
-                SET is_changed = FALSE,
-                    updated_at = CURRENT_TIMESTAMP
-                WHERE cino = ?
-                """, (cino,))
+            cursor.executemany("""
+            UPDATE cases
+            SET is_changed = FALSE,
+                updated_at = CURRENT_TIMESTAMP
+            WHERE cino = ?
+            """, params)
+            # Summed over all executions; each CINO matches at most one row
+            marked_count = cursor.rowcount
                 
-                if cursor.rowcount > 0:
-                    marked_count += 1
-                    
-                # Record in history
-                cursor.execute("""
-                INSERT INTO case_history (cino, field_name, old_value, new_value)
-                VALUES (?, 'bulk_marked_reviewed', 'pending', 'reviewed')
-                """, (cino,))
+            # Record in history
+            cursor.executemany("""
+            INSERT INTO case_history (cino, field_name, old_value, new_value)
+            VALUES (?, 'bulk_marked_reviewed', 'pending', 'reviewed')
+            """, params)
                     
-            conn.commit()
-            conn.close()
+            self._commit(conn)
             
             print(f"✅ Marked {marked_count} cases as reviewed")
             return marked_count
             
         except Exception as e:
+            self._rollback()
             print(f"Error marking multiple cases as reviewed: {e}")
             return 0
 
     def remove_from_reviewed_keep_notes(self, cinos: List[str]) -> int:
         """Remove cases from reviewed section but keep their notes"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             cursor = conn.cursor()
-            removed_count = 0
+            params = [(cino,) for cino in cinos]
             
-            for cino in cinos:
-                # Mark as changed (removes from reviewed) but keep notes
-                cursor.execute("""
-                UPDATE cases
-                SET is_changed = TRUE,
-                    updated_at = CURRENT_TIMESTAMP
-                WHERE cino = ? AND is_changed = FALSE
-                """, (cino,))
+            # Mark as changed (removes from reviewed) but keep notes
+            cursor.executemany("""
+            UPDATE cases
+            SET is_changed = TRUE,
+                updated_at = CURRENT_TIMESTAMP
+            WHERE cino = ? AND is_changed = FALSE
+            """, params)
+            # Summed over all executions; each CINO matches at most one row
+            removed_count = cursor.rowcount
                 
-                if cursor.rowcount > 0:
-                    removed_count += 1
-                    
-                # Record in history
-                cursor.execute("""
-                INSERT INTO case_history (cino, field_name, old_value, new_value)
-                VALUES (?, 'removed_from_reviewed', 'reviewed', 'pending')
-                """, (cino,))
+            # Record in history
+            cursor.executemany("""
+            INSERT INTO case_history (cino, field_name, old_value, new_value)
+            VALUES (?, 'removed_from_reviewed', 'reviewed', 'pending')
+            """, params)
                     
-            conn.commit()
-            conn.close()
+            self._commit(conn)
             
             print(f"✅ Removed {removed_count} cases from reviewed (keeping notes)")
             return removed_count
             
         except Exception as e:
+            self._rollback()
             print(f"Error removing cases from reviewed: {e}")
             return 0
 
     def update_case_user_side(self, cino: str, user_side: str) -> bool:
         """Update case user side with proper history tracking"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             cursor = conn.cursor()
             
             # Get current value first
@@ -615,40 +869,32 @@ class CaseDatabase:
                 VALUES (?, 'user_side_updated', ?, ?)
             """, (cino, old_user_side or '', user_side))
             
-            conn.commit()
+            self._commit(conn)
             success = cursor.rowcount > 0
-            conn.close()
             
             if success:
                 print(f"✅ Updated user side for case {cino}: '{old_user_side}' → '{user_side}'")
             return success
             
         except Exception as e:
+            self._rollback()
             print(f"Error updating user side: {e}")
             return False
     
-    def _row_to_dict(self, row: tuple) -> Dict:
+    def _row_to_dict(self, row: sqlite3.Row) -> Dict:
         """Convert database row to dictionary"""
         if not row:
             return None
-            
-        columns = [
-            'id', 'cino', 'case_no', 'petparty_name', 'resparty_name',
-            'establishment_name', 'state_name', 'district_name', 'date_next_list',
-            'date_last_list', 'purpose_name', 'type_name', 'court_no_desg_name',
-            'disp_name', 'updated_at', 'user_notes', 'is_changed', 'change_summary',
-            'raw_data', 'user_side', 'reg_no', 'reg_year', 'date_of_decision'
-        ]
 
-        
-        result = dict(zip(columns, row))
+        # Keyed by the row's own columns, so narrowed projections map correctly
+        result = dict(row)
         result['is_changed'] = bool(result['is_changed'])
         return result
 
     def delete_all_cases_permanently(self) -> Dict[str, int]:
         """Permanently delete all cases and history from database"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             cursor = conn.cursor()
             
             # Get counts before deletion
@@ -658,26 +904,29 @@ class CaseDatabase:
             cursor.execute("SELECT COUNT(*) FROM case_history")
             history_count = cursor.fetchone()[0]
             
-            # Delete all data permanently
+            # Delete all data permanently. Unqualified DELETEs on tables without
+            # triggers hit SQLite's truncate optimization (no per-row journaling),
+            # so keep this schema trigger-free.
             cursor.execute("DELETE FROM case_history")
+            cursor.execute("DELETE FROM cases_raw")
             cursor.execute("DELETE FROM cases")
             
             # Reset auto-increment counters
             cursor.execute("DELETE FROM sqlite_sequence WHERE name='cases'")
             cursor.execute("DELETE FROM sqlite_sequence WHERE name='case_history'")
             
-            conn.commit()
-            conn.close()
+            self._commit(conn)
             
             print(f"🗑️ All cases deleted permanently: {cases_count} cases, {history_count} history records")
             
-            return {
+            result = {
                 'cases_deleted': cases_count,
                 'history_deleted': history_count,
                 'total_deleted': cases_count + history_count
             }
             
         except Exception as e:
+            self._rollback()
             print(f"Error deleting all cases: {e}")
             return {
                 'cases_deleted': 0,
@@ -686,10 +935,20 @@ class CaseDatabase:
                 'error': str(e)
             }
 
+        # The deletes are committed; reclaiming space is best-effort on top
+        try:
+            # Hand the freed pages back to the filesystem (must run outside a transaction)
+            conn.execute("VACUUM")
+            # In WAL mode the shrunken file only lands on disk at a checkpoint
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        except Exception as vacuum_error:
+            print(f"⚠️ Cases deleted, but the database file was not compacted: {vacuum_error}")
+
+        return result
+
     def backup_data_before_clear(self, backup_path: str = None) -> str:
         """Create a backup of all data before clearing"""
         try:
-            import shutil
             from datetime import datetime
             
             if not backup_path:
@@ -699,8 +958,13 @@ class CaseDatabase:
             # Create backup directory if it doesn't exist
             os.makedirs(os.path.dirname(backup_path), exist_ok=True)
             
-            # Copy the database file
-            shutil.copy2(self.db_path, backup_path)
+            # Online page-level copy: a consistent snapshot that includes
+            # pages still in the WAL, yielding to writers between steps
+            backup_conn = sqlite3.connect(backup_path)
+            try:
+                self._connect().backup(backup_conn, pages=1000)
+            finally:
+                backup_conn.close()
             
             print(f"💾 Database backup created: {backup_path}")
             return backup_path
@@ -716,7 +980,7 @@ class CaseDatabase:
     def update_case_purpose(self, cino: str, purpose: str) -> bool:
         """Update case purpose"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             cursor = conn.cursor()
             
             cursor.execute("""
@@ -731,35 +995,33 @@ class CaseDatabase:
             VALUES (?, 'purpose_updated', '', ?)
             """, (cino, purpose))
             
-            conn.commit()
+            self._commit(conn)
             success = cursor.rowcount > 0
-            conn.close()
             
             if success:
                 print(f"✅ Updated purpose for case {cino}: {purpose}")
             return success
             
         except Exception as e:
+            self._rollback()
             print(f"Error updating purpose: {e}")
             return False
 
     def get_changed_cases(self) -> List[Dict]:
         """Get cases that have changes (is_changed = TRUE)"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
-        cursor.execute("""
-        SELECT * FROM cases
+        cursor.execute(f"""
+        {LIST_SELECT}
         WHERE is_changed = TRUE
         ORDER BY updated_at DESC
         """)
-        cases = cursor.fetchall()
-        conn.close()
-        return [self._row_to_dict(case) for case in cases]
+        return [self._row_to_dict(case) for case in cursor]
 
     def update_case_hearing_date(self, cino: str, hearing_date: str) -> bool:
         """Update case hearing date"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             cursor = conn.cursor()
             
             cursor.execute("""
@@ -775,235 +1037,210 @@ class CaseDatabase:
             VALUES (?, 'hearing_date_updated', '', ?)
             """, (cino, hearing_date))
             
-            conn.commit()
+            self._commit(conn)
             success = cursor.rowcount > 0
-            conn.close()
             
             if success:
                 print(f"✅ Updated hearing date for case {cino}: {hearing_date}")
             return success
             
         except Exception as e:
+            self._rollback()
             print(f"Error updating hearing date: {e}")
             return False
 
     def update_case_hearing_date_with_history(self, cino, new_hearing_date, notes):
         """Update hearing date with proper fallback logic for last hearing date"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             cursor = conn.cursor()
+            # Read and write in one transaction, so the dates moved below are still current
+            cursor.execute("BEGIN IMMEDIATE")
 
-            # Step 1: Get current next hearing date from database
-            cursor.execute("SELECT date_next_list, date_last_list FROM cases WHERE cino = ?", (cino,))
-            result = cursor.fetchone()
-            
-            prev_next_hearing = None
-            current_last_hearing = None
-            
-            if result:
-                prev_next_hearing = result[0] # Current next hearing becomes last hearing
-                current_last_hearing = result[1] # Current last hearing (for fallback)
-                print(f"📅 DB - Current Next: {prev_next_hearing}, Current Last: {current_last_hearing}")
-
-            # Step 2: Fallback to mycases.txt if no next hearing date in database
-            if not prev_next_hearing or prev_next_hearing in ['', 'Not set', 'Not scheduled']:
-                print("🔍 No next hearing in DB, checking mycases.txt...")
-                try:
-                    # Check if mycases.txt exists
-                    mycases_path = 'data/myCases.txt'
-                    if os.path.exists(mycases_path):
-                        with open(mycases_path, 'r', encoding='utf-8') as f:
-                            content = f.read().strip()
-                        
-                        # Parse different formats
-                        if content:
-                            try:
-                                # Try JSON format first
-                                parsed = json.loads(content)
-                                cases_list = []
-                                if isinstance(parsed, list):
-                                    if all(isinstance(item, str) for item in parsed):
-                                        cases_list = [json.loads(item) for item in parsed]
-                                    elif all(isinstance(item, dict) for item in parsed):
-                                        cases_list = parsed
-                                elif isinstance(parsed, dict):
-                                    cases_list = [parsed]
-                            except json.JSONDecodeError:
-                                # Try line-by-line format
-                                cases_list = []
-                                for line in content.splitlines():
-                                    if line.strip() and cino in line:
-                                        try:
-                                            case_data = json.loads(line.strip())
-                                            cases_list.append(case_data)
-                                        except json.JSONDecodeError:
-                                            continue
-                            
-                            # Find the case by CINO
-                            for case_data in cases_list:
-                                if case_data.get('cino') == cino:
-                                    mycases_next_date = case_data.get('date_next_list', '')
-                                    mycases_last_date = case_data.get('date_last_list', '')
-                                    
-                                    if mycases_next_date and mycases_next_date not in ['', 'Not set', 'Not scheduled']:
-                                        prev_next_hearing = mycases_next_date
-                                        print(f"📄 Found in mycases.txt - Next: {mycases_next_date}")
-                                    elif mycases_last_date and mycases_last_date not in ['', 'Not set']:
-                                        prev_next_hearing = mycases_last_date
-                                        print(f"📄 Using last date from mycases.txt: {mycases_last_date}")
-                                    break
-                
-                except Exception as fallback_error:
-                    print(f"⚠️ Fallback to mycases.txt failed: {fallback_error}")
-
-            # Step 3: Final fallback to current last hearing date
-            if not prev_next_hearing and current_last_hearing:
-                prev_next_hearing = current_last_hearing
-                print(f"🔄 Using current last hearing as fallback: {current_last_hearing}")
-
-            # Step 4: Update the database
-            cursor.execute("""
-            UPDATE cases SET
-                date_next_list = ?,
-                date_last_list = ?,
-                user_notes = ?,
-                updated_at = CURRENT_TIMESTAMP
-            WHERE cino = ?
-            """, (new_hearing_date, prev_next_hearing, notes, cino))
-
-            # Step 5: Save notes history for the previous date
-            if notes and prev_next_hearing:
-                cursor.execute("""
-                INSERT INTO case_history (cino, field_name, old_value, new_value)
-                VALUES (?, 'notes_for_date', ?, ?)
-                """, (cino, prev_next_hearing, notes))
-                print(f"📝 Saved notes for date: {prev_next_hearing}")
+            params, history_rows = self._hearing_date_update_params(cursor, cino, new_hearing_date, notes)
+            cursor.execute(UPDATE_HEARING_DATE_SQL, params)
+            cursor.executemany(INSERT_HISTORY_SQL, history_rows)
 
-            # Step 6: Record the hearing date change
-            cursor.execute("""
-            INSERT INTO case_history (cino, field_name, old_value, new_value)
-            VALUES (?, 'hearing_date_updated', ?, ?)
-            """, (cino, prev_next_hearing or 'No previous date', new_hearing_date))
-
-            conn.commit()
-            conn.close()
+            self._commit(conn)
             
-            print(f"✅ Updated hearing date: {prev_next_hearing} → {new_hearing_date}")
+            prev_next_hearing = params[1]
+            if len(history_rows) > 1:
+                logger.debug("Saved notes for date: %s", prev_next_hearing)
+            logger.debug("Updated hearing date for %s: %s → %s", cino, prev_next_hearing, new_hearing_date)
             return True
 
         except Exception as e:
+            self._rollback()
             print(f"❌ Error updating hearing date with history: {e}")
             return False
 
+    def _hearing_date_update_params(self, cursor, cino: str, new_hearing_date: str, notes: str) -> tuple:
+        """Build the UPDATE_HEARING_DATE_SQL parameters and case_history rows for a hearing date change"""
+        # Step 1: Get current next hearing date from database
+        cursor.execute("SELECT date_next_list, date_last_list FROM cases WHERE cino = ?", (cino,))
+        result = cursor.fetchone()
+        
+        prev_next_hearing = None
+        current_last_hearing = None
+        
+        if result:
+            prev_next_hearing = result[0] # Current next hearing becomes last hearing
+            current_last_hearing = result[1] # Current last hearing (for fallback)
+            logger.debug("DB - Current Next: %s, Current Last: %s", prev_next_hearing, current_last_hearing)
+
+        # Step 2: Fallback to the case's record from the last imported myCases.txt
+        if not prev_next_hearing or prev_next_hearing in NO_HEARING_DATES:
+            logger.debug("No next hearing in DB for %s, checking its imported record", cino)
+            try:
+                # process_daily_file keeps each case's original record in cases_raw,
+                # so this is a primary-key lookup rather than a scan of the file
+                cursor.execute("SELECT raw_data FROM cases_raw WHERE cino = ?", (cino,))
+                raw_row = cursor.fetchone()
+                if raw_row and raw_row[0]:
+                    case_data = _unpack_raw_data(raw_row[0])
+                    mycases_next_date = case_data.get('date_next_list', '')
+                    mycases_last_date = case_data.get('date_last_list', '')
+                    
+                    if mycases_next_date and mycases_next_date not in NO_HEARING_DATES:
+                        prev_next_hearing = mycases_next_date
+                        logger.debug("Found in mycases.txt - Next: %s", mycases_next_date)
+                    elif mycases_last_date and mycases_last_date not in NO_HEARING_DATES:
+                        prev_next_hearing = mycases_last_date
+                        logger.debug("Using last date from mycases.txt: %s", mycases_last_date)
+            
+            except Exception as fallback_error:
+                print(f"⚠️ Fallback to mycases.txt failed: {fallback_error}")
+
+        # Step 3: Final fallback to current last hearing date
+        if not prev_next_hearing and current_last_hearing:
+            prev_next_hearing = current_last_hearing
+            logger.debug("Using current last hearing as fallback: %s", current_last_hearing)
+
+        # Step 4: Move the previous date into date_last_list
+        params = (new_hearing_date, prev_next_hearing, notes, cino)
+
+        history_rows = []
+        # Step 5: Save notes history for the previous date
+        if notes and prev_next_hearing:
+            history_rows.append((cino, 'notes_for_date', prev_next_hearing, notes))
+
+        # Step 6: Record the hearing date change
+        history_rows.append((cino, 'hearing_date_updated', prev_next_hearing or 'No previous date', new_hearing_date))
+        return params, history_rows
+
     def get_case_notes_history(self, cino: str) -> List[Dict]:
         """Get notes history for a case grouped by hearing dates"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             cursor = conn.cursor()
             
             cursor.execute("""
-            SELECT old_value as hearing_date, new_value as notes, changed_at
+            SELECT old_value AS date, new_value AS notes, changed_at AS timestamp
             FROM case_history
             WHERE cino = ? AND field_name = 'notes_for_date'
             ORDER BY changed_at DESC
             """, (cino,))
             
-            history = cursor.fetchall()
-            conn.close()
+            return [dict(row) for row in cursor]
+            
+        except Exception as e:
+            print(f"Error getting notes history: {e}")
+            return []
+
+    def get_change_summary(self, cino: str) -> List[str]:
+        """Describe the field changes from the most recent import that changed this case"""
+        try:
+            conn = self._connect()
+            cursor = conn.cursor()
+            
+            placeholders = ','.join('?' * len(COMPARED_FIELDS))
+            cursor.execute(f"""
+            SELECT field_name, old_value, new_value
+            FROM case_history
+            WHERE cino = ? AND field_name IN ({placeholders})
+            AND changed_at = (
+                SELECT MAX(changed_at) FROM case_history
+                WHERE cino = ? AND field_name IN ({placeholders})
+            )
+            ORDER BY id
+            """, (cino, *COMPARED_FIELDS, cino, *COMPARED_FIELDS))
             
             return [
-                {
-                    'date': row[0],
-                    'notes': row[1],
-                    'timestamp': row[2]
-                }
-                for row in history
+                f"{row['field_name']}: {row['old_value']} → {row['new_value']}"
+                for row in cursor
             ]
             
         except Exception as e:
-            print(f"Error getting notes history: {e}")
+            print(f"Error getting change summary: {e}")
             return []
 
     def update_case_field(self, cino: str, field_name: str, field_value: str) -> bool:
         """Update any case field"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-
             # Valid fields that can be updated
-            valid_fields = [
-                'petparty_name', 'resparty_name', 'purpose_name',
-                'type_name', 'court_no_desg_name', 'user_side', 'date_of_decision'
-            ]
-
-            if field_name not in valid_fields:
+            update_sql = UPDATE_FIELD_SQL.get(field_name)
+            if update_sql is None:
                 return False
 
+            conn = self._connect()
+            cursor = conn.cursor()
+
             # Handle empty date fields properly
             if field_name == 'date_of_decision' and not field_value.strip():
                 field_value = None
             
-            cursor.execute(f"""
-                UPDATE cases
-                SET {field_name} = ?, updated_at = CURRENT_TIMESTAMP
-                WHERE cino = ?
-            """, (field_value, cino))
+            cursor.execute(update_sql, (field_value, cino))
+            if cursor.rowcount == 0:
+                self._rollback()
+                return False
 
             # Record the change
-            cursor.execute("""
-                INSERT INTO case_history (cino, field_name, old_value, new_value)
-                VALUES (?, ?, '', ?)
-            """, (cino, f'{field_name}_updated', field_value or ''))
-
-            conn.commit()
-            success = cursor.rowcount > 0
-            conn.close()
+            cursor.execute(INSERT_HISTORY_SQL, (cino, f'{field_name}_updated', '', field_value or ''))
 
-            return success
+            self._commit(conn)
+            return True
 
         except Exception as e:
+            self._rollback()
             print(f"Error updating case field: {e}")
             return False
 
     def get_notes_by_date(self, cino, hearing_date):
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         cursor.execute("""
         SELECT new_value FROM case_history WHERE cino = ? AND field_name = 'notes_for_date' AND old_value = ?
         ORDER BY id DESC
         """, (cino, hearing_date))
-        notes = [row[0] for row in cursor.fetchall()]
-        conn.close()
-        return notes
-    
+        return [row[0] for row in cursor]
+
     # function to get active cases and dispose cases using date_of_decision
     def get_active_and_disposed_cases(self) -> Dict[str, List[Dict]]:
         """Get active cases and disposed cases based on date_of_decision"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             cursor = conn.cursor()
             
             # Active cases: date_of_decision is NULL or empty
-            cursor.execute("""
-            SELECT * FROM cases
+            cursor.execute(f"""
+            {LIST_SELECT}
             WHERE (date_of_decision IS NULL OR date_of_decision = '')
             ORDER BY updated_at DESC
             """)
-            active_cases = cursor.fetchall()
+            active_cases = [self._row_to_dict(case) for case in cursor]
             
             # Disposed cases: date_of_decision is set
-            cursor.execute("""
-            SELECT * FROM cases
+            cursor.execute(f"""
+            {LIST_SELECT}
             WHERE date_of_decision IS NOT NULL AND date_of_decision != ''
             ORDER BY date_of_decision DESC
             """)
-            disposed_cases = cursor.fetchall()
+            disposed_cases = [self._row_to_dict(case) for case in cursor]
             
-            conn.close()
             
             return {
-                'active_cases': [self._row_to_dict(case) for case in active_cases],
-                'disposed_cases': [self._row_to_dict(case) for case in disposed_cases]
+                'active_cases': active_cases,
+                'disposed_cases': disposed_cases
             }
             
         except Exception as e:
@@ -1017,7 +1254,7 @@ class CaseDatabase:
     def restore_all_fields_and_unmark_reviewed(self, cino: str) -> bool:
         """Restore ALL fields to their exact previous state before review"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             cursor = conn.cursor()
             
             # Get the most recent complete state before review
@@ -1086,22 +1323,22 @@ class CaseDatabase:
                     VALUES (?, 'fallback_clear', 'reviewed_state', 'cleared_user_data')
                 """, (cino,))
             
-            conn.commit()
+            self._commit(conn)
             success = cursor.rowcount > 0
-            conn.close()
             
             if success:
                 print(f"✅ Completely restored case {cino} to previous state")
             return success
             
         except Exception as e:
+            self._rollback()
             print(f"❌ Error restoring complete state for case {cino}: {e}")
             return False
 
     def unmark_reviewed_and_clear_all_fields(self, cino: str) -> bool:
         """Unmark case as reviewed and clear ALL user-modifiable fields"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             cursor = conn.cursor()
             
             # Get current state for history
@@ -1112,7 +1349,6 @@ class CaseDatabase:
             current_result = cursor.fetchone()
             
             if not current_result:
-                conn.close()
                 return False
                 
             current_notes, current_next_date, current_decision_date, current_user_side = current_result
@@ -1140,22 +1376,22 @@ class CaseDatabase:
                     'user_side': current_user_side or ''
                 })))
             
-            conn.commit()
+            self._commit(conn)
             success = cursor.rowcount > 0
-            conn.close()
             
             if success:
                 print(f"✅ Cleared all user fields for case {cino}")
             return success
             
         except Exception as e:
+            self._rollback()
             print(f"❌ Error clearing all fields for case {cino}: {e}")
             return False
 
     def update_case_date_of_decision(self, cino: str, date_of_decision: str) -> bool:
         """Update case date of decision with proper history tracking"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             cursor = conn.cursor()
             
             # Get current value first
@@ -1175,22 +1411,22 @@ class CaseDatabase:
                 VALUES (?, 'date_of_decision_updated', ?, ?)
             """, (cino, old_decision_date or '', date_of_decision))
             
-            conn.commit()
+            self._commit(conn)
             success = cursor.rowcount > 0
-            conn.close()
             
             if success:
                 print(f"✅ Updated date of decision for case {cino}: '{old_decision_date}' → '{date_of_decision}'")
             return success
             
         except Exception as e:
+            self._rollback()
             print(f"Error updating date of decision: {e}")
             return False
     
     def restore_previous_notes_and_unmark_reviewed(self, cino: str) -> bool:
         """Restore previous notes and unmark case as reviewed"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             cursor = conn.cursor()
             
             # Get the current notes before reverting
@@ -1234,9 +1470,8 @@ class CaseDatabase:
             VALUES (?, 'unmarked_and_reverted', ?, ?)
             """, (cino, current_notes, previous_notes))
             
-            conn.commit()
+            self._commit(conn)
             success = cursor.rowcount > 0
-            conn.close()
             
             if success:
                 print(f"✅ Unmarked case {cino} and reverted notes: '{current_notes}' → '{previous_notes}'")
@@ -1244,13 +1479,14 @@ class CaseDatabase:
             return success
             
         except Exception as e:
+            self._rollback()
             print(f"❌ Error unmarking and reverting case {cino}: {e}")
             return False
 
     def update_case_notes_without_marking_reviewed(self, cino: str, notes: str) -> bool:
         """Update case notes but keep case in pending state (is_changed = TRUE)"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             cursor = conn.cursor()
             
             cursor.execute("""
@@ -1266,9 +1502,8 @@ class CaseDatabase:
             VALUES (?, 'notes_updated_pending', '', ?)
             """, (cino, notes))
             
-            conn.commit()
+            self._commit(conn)
             success = cursor.rowcount > 0
-            conn.close()
             
             if success:
                 print(f"✅ Updated notes for case {cino} (kept in pending state)")
@@ -1276,6 +1511,7 @@ class CaseDatabase:
             return success
             
         except Exception as e:
+            self._rollback()
             print(f"❌ Error updating notes without marking reviewed: {e}")
             return False
 
@@ -1297,7 +1533,7 @@ class CaseDatabase:
     def unmark_reviewed_and_clear_notes(self, cino: str) -> bool:
         """Unmark case as reviewed and clear all notes completely"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             cursor = conn.cursor()
             
             # Get current notes before clearing (for history)
@@ -1320,15 +1556,15 @@ class CaseDatabase:
                 VALUES (?, 'unmarked_and_notes_cleared', ?, '')
             """, (cino, current_notes))
             
-            conn.commit()
+            self._commit(conn)
             success = cursor.rowcount > 0
-            conn.close()
             
             if success:
                 print(f"✅ Unmarked case {cino} and cleared all notes")
             return success
             
         except Exception as e:
+            self._rollback()
             print(f"❌ Error unmarking and clearing notes for case {cino}: {e}")
             return False
 
@@ -1365,7 +1601,7 @@ class CaseDatabase:
     def restore_complete_case_state_and_unmark(self, cino: str) -> bool:
         """Restore COMPLETE case state (all fields) to exact previous state before review"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             cursor = conn.cursor()
             
             # Get the most recent complete state before review
@@ -1458,22 +1694,22 @@ class CaseDatabase:
                     VALUES (?, 'fallback_clear_user_data', 'reviewed_state', 'cleared_user_additions')
                 """, (cino,))
             
-            conn.commit()
+            self._commit(conn)
             success = cursor.rowcount > 0
-            conn.close()
             
             if success:
                 print(f"✅ COMPLETELY restored case {cino} to previous state - ALL FIELDS")
             return success
             
         except Exception as e:
+            self._rollback()
             print(f"❌ Error restoring complete state for case {cino}: {e}")
             return False
 
     def unmark_reviewed_and_clear_all_user_data(self, cino: str) -> bool:
         """Unmark case as reviewed and clear ALL user-added data (not original case data)"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             cursor = conn.cursor()
             
             # Get current state for history
@@ -1484,7 +1720,6 @@ class CaseDatabase:
             current_result = cursor.fetchone()
             
             if not current_result:
-                conn.close()
                 return False
                 
             current_notes, current_decision_date, current_user_side = current_result
@@ -1511,15 +1746,15 @@ class CaseDatabase:
                     'user_side': current_user_side or ''
                 })))
             
-            conn.commit()
+            self._commit(conn)
             success = cursor.rowcount > 0
-            conn.close()
             
             if success:
                 print(f"✅ Cleared user data for case {cino} (kept original case data)")
             return success
             
         except Exception as e:
+            self._rollback()
             print(f"❌ Error clearing user data for case {cino}: {e}")
             return False
         
@@ -1556,7 +1791,7 @@ class CaseDatabase:
     def update_case_notes_and_mark_reviewed(self, cino: str, notes: str, next_hearing_date: str = None, date_of_decision: str = None) -> bool:
         """Update case notes, dates, and mark as reviewed - WITH COMPLETE STATE TRACKING"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             cursor = conn.cursor()
             
             # FIRST: Get COMPLETE current state before making ANY changes
@@ -1570,7 +1805,6 @@ class CaseDatabase:
             current_result = cursor.fetchone()
             
             if not current_result:
-                conn.close()
                 return False
             
             # Create complete state snapshot BEFORE changes
@@ -1631,9 +1865,8 @@ class CaseDatabase:
                 json.dumps(current_state, indent=2),  # Complete original state
                 json.dumps(new_state, indent=2)))     # Complete new state after review
             
-            conn.commit()
+            self._commit(conn)
             success = cursor.rowcount > 0
-            conn.close()
             
             if success:
                 print(f"✅ Updated and marked case {cino} as reviewed with COMPLETE state backup")
@@ -1641,8 +1874,6 @@ class CaseDatabase:
             return success
             
         except Exception as e:
+            self._rollback()
             print(f"❌ Error updating case and storing complete state: {e}")
-            if 'conn' in locals():
-                conn.rollback()
-                conn.close()
             return False
@@ -0,0 +1,25 @@
+import json
+import os
+import sys
+
+import pytest
+
+# The app modules are imported as top-level modules (see app.py)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import CaseDatabase  # noqa: E402
+
+
+@pytest.fixture
+def db(tmp_path):
+    return CaseDatabase(str(tmp_path / 'cases.db'))
+
+
+@pytest.fixture
+def write_daily_file(tmp_path):
+    """Write case records as newline-delimited JSON, the usual myCases.txt layout"""
+    def write(records, name='myCases.txt'):
+        path = tmp_path / name
+        path.write_text('\n'.join(json.dumps(record) for record in records), encoding='utf-8')
+        return str(path)
+    return write
@@ -0,0 +1,149 @@
+import datetime
+import json
+
+import pytest
+
+pytest.importorskip('googleapiclient')
+pytest.importorskip('google_auth_oauthlib')
+pytest.importorskip('google_auth_httplib2')
+
+import httplib2  # noqa: E402
+from googleapiclient.errors import HttpError  # noqa: E402
+
+import calendar_utils  # noqa: E402
+
+RECENT = (datetime.date.today() + datetime.timedelta(days=30)).isoformat()
+OLD = (datetime.date.today() - datetime.timedelta(days=400)).isoformat()
+
+
+class FakeCalendar:
+    """events().list over an in-memory calendar, two events per page, honouring syncToken"""
+
+    def __init__(self, events):
+        self.events = {event['id']: event for event in events}
+        self.token = 'token-1'
+        self.changed = set()
+        self.sync_tokens = []
+
+    def list(self, calendarId, pageToken=None, syncToken=None, **params):
+        self.sync_tokens.append(syncToken)
+        return _Request(lambda: self._page(pageToken, syncToken))
+
+    def _page(self, page_token, sync_token):
+        if sync_token is not None and sync_token != self.token:
+            raise HttpError(httplib2.Response({'status': 410}), b'')
+        items = list(self.events.values())
+        if sync_token is not None:
+            items = [event for event in items if event['id'] in self.changed]
+        start = int(page_token or 0)
+        page = {'items': [dict(event) for event in items[start:start + 2]]}
+        if start + 2 < len(items):
+            page['nextPageToken'] = str(start + 2)
+        else:
+            page['nextSyncToken'] = self.token
+        return page
+
+
+class _Request:
+    def __init__(self, run):
+        self.execute = run
+
+
+class _Service:
+    def __init__(self, calendar):
+        self._calendar = calendar
+
+    def events(self):
+        return self._calendar
+
+
+def court_event(event_id, date, cino=None, description=''):
+    event = {'id': event_id, 'summary': 'A vs B', 'description': description, 'start': {'date': date}}
+    if cino:
+        event['extendedProperties'] = {'private': {'source': 'ecourts', 'cino': cino}}
+    return event
+
+
+@pytest.fixture
+def state_path(tmp_path, monkeypatch):
+    path = tmp_path / 'calendar_sync.json'
+    monkeypatch.setattr(calendar_utils, '_SYNC_STATE_PATH', str(path))
+    return path
+
+
+def sync(calendar, account='acct'):
+    return list(calendar_utils.iter_existing_court_events(_Service(calendar), 'primary', account))
+
+
+def test_saved_state_keeps_only_ids_cinos_and_dates(state_path):
+    calendar = FakeCalendar([
+        court_event('a', RECENT, cino='C1', description='Case No: X/1/2024'),
+        court_event('b', RECENT, description='CINO: ABCD010000012024'),
+        # Untagged and older than the lookback: never matched, so it may not block the token
+        court_event('c', OLD, description='Case No: Y/2/2020'),
+    ])
+
+    assert sorted(event['id'] for event in sync(calendar)) == ['a', 'b']
+    assert json.loads(state_path.read_text()) == {'acct:primary': {
+        'sync_token': 'token-1',
+        'events': {
+            'a': {'cino': 'C1', 'date': RECENT},
+            'b': {'cino': 'ABCD010000012024', 'date': RECENT},
+            'c': {'cino': None, 'date': OLD},
+        },
+    }}
+
+    # The next run is incremental and picks up only the changed event
+    calendar.events['a']['start'] = {'date': OLD}
+    calendar.changed = {'a'}
+    assert [event['id'] for event in sync(calendar)] == ['b']
+    assert calendar.sync_tokens[-1] == 'token-1'
+
+
+def test_recent_event_without_cino_forces_full_sync(state_path):
+    calendar = FakeCalendar([court_event('a', RECENT, cino='C1')])
+    sync(calendar)
+
+    calendar.events['d'] = court_event('d', RECENT, description='Case No: Z/3/2024')
+    calendar.changed = {'d'}
+    events = {event['id']: event for event in sync(calendar)}
+
+    assert events['d']['description'] == 'Case No: Z/3/2024'
+    # Its description is never written out, so no token is kept for this calendar
+    assert json.loads(state_path.read_text()) == {}
+    sync(calendar)
+    assert calendar.sync_tokens[-1] is None
+
+
+def test_expired_token_runs_full_sync(state_path):
+    calendar = FakeCalendar([court_event('a', RECENT, cino='C1'), court_event('b', RECENT, cino='C2')])
+    sync(calendar)
+
+    del calendar.events['b']
+    calendar.token = 'token-2'
+    assert [event['id'] for event in sync(calendar)] == ['a']
+    assert calendar.sync_tokens[-2:] == ['token-1', None]
+    assert json.loads(state_path.read_text())['acct:primary']['sync_token'] == 'token-2'
+
+
+def test_state_is_not_shared_between_accounts(state_path):
+    state_path.write_text(json.dumps({'primary': {'sync_token': 'old', 'events': {'x': {'summary': 'A vs B'}}}}))
+    calendar = FakeCalendar([court_event('a', RECENT, cino='C1')])
+    sync(calendar, 'first')
+
+    calendar.changed = set()
+    assert [event['id'] for event in sync(calendar, 'second')] == ['a']
+    assert calendar.sync_tokens[-1] is None
+    # Another account's entries and state in the old format are dropped on save
+    assert list(json.loads(state_path.read_text())) == ['second:primary']
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('2024-02-29', '2024-02-29'),
+    ('29/02/2024', '2024-02-29'),
+    ('2024-02-30', None),
+    ('2024-13-01', None),
+    ('30/02/2024', None),
+])
+def test_normalize_event_date(value, expected):
+    assert calendar_utils._normalize_event_date(value) == expected
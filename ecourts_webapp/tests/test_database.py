@@ -0,0 +1,211 @@
+import json
+import sqlite3
+
+import pytest
+
+from database import INSERT_HISTORY_SQL, SCHEMA_VERSION, CaseDatabase, _unpack_raw_data
+
+# cases as created before the user_side/reg_no/date_of_decision columns and cases_raw
+OLD_CASES_DDL = """
+CREATE TABLE cases (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    cino TEXT UNIQUE,
+    case_no TEXT,
+    petparty_name TEXT,
+    resparty_name TEXT,
+    establishment_name TEXT,
+    state_name TEXT,
+    district_name TEXT,
+    date_next_list TEXT,
+    date_last_list TEXT,
+    purpose_name TEXT,
+    type_name TEXT,
+    court_no_desg_name TEXT,
+    disp_name TEXT,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    user_notes TEXT DEFAULT '',
+    is_changed BOOLEAN DEFAULT FALSE,
+    change_summary TEXT DEFAULT '',
+    raw_data TEXT
+)
+"""
+
+
+def test_connect_keeps_open_transaction(db):
+    conn = db._connect()
+    conn.execute("BEGIN IMMEDIATE")
+    conn.execute(INSERT_HISTORY_SQL, ('C1', 'field', 'old', 'new'))
+
+    # A helper fetching the connection mid-transaction must not discard the caller's writes
+    assert db._connect() is conn
+    assert conn.in_transaction
+    db._commit(conn)
+
+    assert conn.execute("SELECT COUNT(*) FROM case_history").fetchone()[0] == 1
+
+
+def test_failed_write_is_rolled_back(db, monkeypatch):
+    conn = db._connect()
+
+    def fail(_conn):
+        raise RuntimeError("disk full")
+
+    # The UPDATE runs, then the commit fails: nothing may be left pending
+    db.create_new_case({'cino': 'C1', 'case_no': '1'})
+    monkeypatch.setattr(db, '_commit', fail)
+    assert db.update_case_field('C1', 'purpose_name', 'Arguments') is False
+    assert not conn.in_transaction
+    monkeypatch.undo()
+
+    assert db.get_case_by_cino('C1')['purpose_name'] == ''
+
+
+# Version 0 kept raw_data in cases; version 3 kept it in cases_raw as uncompressed JSON text
+@pytest.mark.parametrize('user_version', [0, 3])
+def test_init_database_migrates_raw_data(tmp_path, user_version):
+    path = str(tmp_path / 'old.db')
+    record = {'cino': 'C1', 'case_no': '1', 'date_next_list': '2024-05-01'}
+    old = sqlite3.connect(path)
+    old.execute(OLD_CASES_DDL)
+    old.execute("INSERT INTO cases (cino, case_no, date_next_list) VALUES ('C1', '1', '2024-05-01')")
+    if user_version == 0:
+        old.execute("UPDATE cases SET raw_data = ? WHERE cino = 'C1'", (json.dumps(record),))
+    else:
+        old.execute("CREATE TABLE cases_raw (cino TEXT PRIMARY KEY, raw_data BLOB)")
+        old.execute("INSERT INTO cases_raw VALUES ('C1', ?)", (json.dumps(record),))
+    old.execute(f"PRAGMA user_version = {user_version}")
+    old.commit()
+    old.close()
+
+    db = CaseDatabase(path)
+    conn = db._connect()
+
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+    assert conn.execute("SELECT raw_data FROM cases WHERE cino = 'C1'").fetchone()[0] is None
+    raw = conn.execute("SELECT raw_data FROM cases_raw WHERE cino = 'C1'").fetchone()[0]
+    assert isinstance(raw, bytes)
+    assert _unpack_raw_data(raw) == record
+    assert db.get_case_by_cino('C1')['user_side'] == ''
+
+
+def test_process_daily_file_detects_changes(db, write_daily_file):
+    first = [
+        {'cino': 'C1', 'case_no': '1', 'purpose_name': 'Hearing', 'disp_name': None},
+        {'cino': 'C2', 'case_no': '2', 'purpose_name': 'Hearing'},
+    ]
+    assert db.process_daily_file(write_daily_file(first)) == {'new': 2, 'updated': 0, 'unchanged': 0}
+    assert db.get_changed_cases() == []
+
+    # C1 only swaps a null for a missing field; C2 changes twice within one file
+    second = [
+        {'cino': 'C1', 'case_no': '1', 'purpose_name': 'Hearing'},
+        {'cino': 'C2', 'case_no': '2', 'purpose_name': 'Arguments'},
+        {'cino': 'C2', 'case_no': '2', 'purpose_name': 'Orders'},
+    ]
+    assert db.process_daily_file(write_daily_file(second)) == {'new': 0, 'updated': 2, 'unchanged': 1}
+
+    assert [case['cino'] for case in db.get_changed_cases()] == ['C2']
+    assert db.get_case_by_cino('C2')['purpose_name'] == 'Orders'
+    history = db._connect().execute(
+        "SELECT field_name, old_value, new_value FROM case_history WHERE cino = 'C2' ORDER BY id"
+    ).fetchall()
+    assert [tuple(row) for row in history] == [
+        ('purpose_name', 'Hearing', 'Arguments'),
+        ('purpose_name', 'Arguments', 'Orders'),
+    ]
+
+
+def test_update_case_field_unknown_cino(db):
+    db.create_new_case({'cino': 'C1', 'case_no': '1'})
+    conn = db._connect()
+
+    assert db.update_case_field('MISSING', 'purpose_name', 'Arguments') is False
+    assert db.update_case_field('C1', 'no_such_field', 'x') is False
+    assert not conn.in_transaction
+    # No history row may be written for a case that does not exist
+    assert conn.execute("SELECT COUNT(*) FROM case_history").fetchone()[0] == 0
+
+    assert db.update_case_field('C1', 'purpose_name', 'Arguments') is True
+    assert db.get_case_by_cino('C1')['purpose_name'] == 'Arguments'
+
+
+@pytest.mark.parametrize('record, expected_previous', [
+    ({'date_next_list': '2024-03-01', 'date_last_list': '2024-01-15'}, '2024-03-01'),
+    ({'date_next_list': 'Not set', 'date_last_list': '2024-01-15'}, '2024-01-15'),
+])
+def test_hearing_date_falls_back_to_imported_record(db, write_daily_file, record, expected_previous):
+    db.process_daily_file(write_daily_file([dict(record, cino='C1', case_no='1')]))
+    conn = db._connect()
+    # The stored case has lost its dates; only the cases_raw copy still has them
+    conn.execute("UPDATE cases SET date_next_list = 'Not set', date_last_list = NULL WHERE cino = 'C1'")
+    conn.commit()
+
+    assert db.update_case_hearing_date_with_history('C1', '2024-06-01', 'Adjourned') is True
+
+    case = db.get_case_by_cino('C1')
+    assert case['date_next_list'] == '2024-06-01'
+    assert case['date_last_list'] == expected_previous
+    assert db.get_notes_by_date('C1', expected_previous) == ['Adjourned']
+
+
+def test_case_counts_see_writes_from_other_connections(db, tmp_path):
+    db.create_new_case({'cino': 'C1', 'case_no': '1'})
+    assert db.get_case_counts()['total_cases'] == 1
+
+    # Another CaseDatabase on the same file, like the system cleanup uses
+    CaseDatabase(str(tmp_path / 'cases.db')).clear_all_data()
+    assert db.get_case_counts()['total_cases'] == 0
+
+    db.create_new_case({'cino': 'C2', 'case_no': '2'})
+    assert db.get_case_counts()['total_cases'] == 1
+
+
+def test_delete_all_cases_survives_failed_vacuum(db):
+    db.create_new_case({'cino': 'C1', 'case_no': '1'})
+    conn = db._connect()
+    # An open read statement makes VACUUM fail with "SQL statements in progress"
+    reader = conn.execute("SELECT 1 UNION ALL SELECT 2")
+    reader.fetchone()
+
+    result = db.delete_all_cases_permanently()
+    reader.close()
+
+    assert result == {'cases_deleted': 1, 'history_deleted': 0, 'total_deleted': 1}
+    assert db.get_all_cases() == []
+
+
+def test_import_is_reported_when_statistics_refresh_is_blocked(db, write_daily_file, tmp_path):
+    # Another connection holds the write lock once the import has committed
+    other = sqlite3.connect(str(tmp_path / 'cases.db'), timeout=0)
+    real_commit = db._commit
+
+    def commit_then_lock(conn):
+        real_commit(conn)
+        conn.execute("PRAGMA busy_timeout = 0")
+        other.execute("BEGIN IMMEDIATE")
+
+    db._commit = commit_then_lock
+    try:
+        stats = db.process_daily_file(write_daily_file([{'cino': 'C1', 'case_no': '1'}] * 30))
+    finally:
+        other.rollback()
+        other.close()
+
+    assert stats == {'new': 1, 'updated': 0, 'unchanged': 29}
+    assert db.get_case_by_cino('C1') is not None
+
+
+def test_export_carries_the_original_record(db, write_daily_file):
+    record = {'cino': 'C1', 'case_no': '1', 'fil_no': '77', 'establishment_code': 'MHAU01'}
+    db.process_daily_file(write_daily_file([record]))
+    db.create_new_case({'cino': 'C2', 'case_no': '2'})
+    # A case whose original record was never stored
+    conn = db._connect()
+    conn.execute("DELETE FROM cases_raw WHERE cino = 'C2'")
+    conn.commit()
+
+    exported = {case['cino']: case for case in db.get_all_cases_for_export()}
+
+    assert json.loads(exported['C1']['raw_data']) == record
+    assert exported['C2']['raw_data'] is None
+    assert {'id', 'updated_at', 'user_notes', 'is_changed'} <= set(exported['C1'])